@@ -28,14 +28,16 @@ try:
     from pydantic import BaseModel
     from sqlalchemy import Float, Integer, DateTime, Column, String, Boolean, create_engine
     from sqlalchemy.orm import Mapped, declarative_base, mapped_column, sessionmaker
-    from slowapi import Limiter, _rate_limit_exceeded_handler
-    from slowapi.util import get_remote_address
-    from slowapi.errors import RateLimitExceeded
 except ImportError as e:
     logger.error("Import error: {str(e)}. Please install missing packages.")
     print(f"Import error: {str(e)}. Please install missing packages.")
     raise
 
+try:
+    from .rate_limiter import RateLimitMiddleware, TokenBucketLimiter
+except ImportError:
+    from rate_limiter import RateLimitMiddleware, TokenBucketLimiter
+
 # ---------------------------------------------------------------------------
 # ► CONFIG
 # ---------------------------------------------------------------------------
@@ -49,6 +51,10 @@ AGENT_EMBEDDED = os.getenv("AGENT_EMBEDDED", "1") == "1"  # Default to embedded
 # By limiting rate more strictly for exploration endpoints and more loosely for stability endpoints
 RATE_LIMIT_DEFAULT = os.getenv("RATE_LIMIT_DEFAULT", "30/minute")  # Default rate limit
 RATE_LIMIT_CHAT = os.getenv("RATE_LIMIT_CHAT", "15/minute")       # Chat endpoints (higher exploration)
+# Proxies allowed to set X-Forwarded-For (comma-separated addresses)
+TRUSTED_PROXIES = [
+    proxy.strip() for proxy in os.getenv("TRUSTED_PROXIES", "").split(",") if proxy.strip()
+]
 
 if not OPENAI_API_KEY:
     logger.warning("OPENAI_API_KEY missing – AI functionality will be limited")
@@ -190,16 +196,14 @@ app = FastAPI(title="WiltonOS AI Agent", version="0.2.0")
 
 # Configurar o limitador de taxa (rate limiter) para o aplicativo
 # Configuração mantém a proporção quântica 3:1 (75% stability, 25% exploration)
-limiter = Limiter(
-    key_func=get_remote_address,  # Função para obter o endereço IP do cliente
-    default_limits=[RATE_LIMIT_DEFAULT],  # Limite padrão para todas as rotas
-    headers_enabled=True,  # Inclui headers de rate limit na resposta
-    strategy="fixed-window",  # Estratégia de janela fixa (mais eficiente para APIs)
-)
+limiter = TokenBucketLimiter({
+    "/chat": RATE_LIMIT_CHAT,        # Limite mais restrito (exploração maior)
+    "/metrics": RATE_LIMIT_DEFAULT,  # Limite padrão (mais permissivo para estabilidade)
+    "/health": RATE_LIMIT_DEFAULT,
+})
 
-# Aplicar o rate limiter ao aplicativo FastAPI
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Aplicar o rate limiter ao aplicativo FastAPI (middleware ASGI puro)
+app.add_middleware(RateLimitMiddleware, limiter=limiter, trusted_proxies=TRUSTED_PROXIES)
 
 # Add CORS middleware
 app.add_middleware(
@@ -374,12 +378,10 @@ async def websocket_endpoint(websocket: WebSocket):
 
 
 @app.post("/chat", response_model=ChatResponse)
-@limiter.limit(RATE_LIMIT_CHAT)  # Limite mais restrito para endpoint de chat (exploração maior)
 async def chat(
     request: ChatRequest,
     session = Depends(get_db),
     background_tasks: BackgroundTasks = None,
-    request_obj: Request = None,  # Para o rate limiter
 ) -> ChatResponse:
     """AI chat endpoint with quantum balance metrics"""
     if not OPENAI_API_KEY:
@@ -426,12 +428,10 @@ async def chat(
 
 
 @app.get("/metrics")
-@limiter.limit(RATE_LIMIT_DEFAULT)  # Usa limite padrão (mais permissivo para estabilidade)
 async def metrics(
     session = Depends(get_db),
     limit: int = 100,
     diff_threshold: float = 0.01,
-    request_obj: Request = None,  # Para o rate limiter
 ):
     """Stream metrics as ND-JSON with configurable difference filter
 
@@ -512,10 +512,8 @@ async def metrics(
 
 
 @app.get("/health")
-@limiter.limit(RATE_LIMIT_DEFAULT)  # Limite padrão (mais permissivo para estabilidade)
 async def health(
     session = Depends(get_db),
-    request_obj: Request = None,  # Para o rate limiter
 ) -> Dict[str, Any]:
     """Health check endpoint with quantum balance metrics"""
     try:
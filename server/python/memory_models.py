@@ -6,10 +6,15 @@ maintaining compatibility with the Node.js Drizzle schema.
 """
 
 import os
+import io
+import csv
+import hashlib
 import datetime
-from typing import cast
+from typing import Any, Dict, List, Optional, Sequence
+import orjson
 from sqlmodel import Field, SQLModel, create_engine, Session, select
-from sqlalchemy import JSON, Column
+from sqlalchemy import JSON, Column, BigInteger, ForeignKey, Integer, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
 
 # Get database URL from environment
 DATABASE_URL = os.environ.get("DATABASE_URL", "")
@@ -19,35 +24,35 @@ engine = create_engine(DATABASE_URL)
 
 # Memory sources
 class MemorySources:
-    self.CHATGPT = 'chatgpt'
-    self.BROWSER = 'browser'
-    self.FINANCE = 'finance'
-    self.PERSONAL = 'personal'
-    self.PYTHON_BOOT_LOADER = 'python-boot-loader'
+    CHATGPT = 'chatgpt'
+    BROWSER = 'browser'
+    FINANCE = 'finance'
+    PERSONAL = 'personal'
+    PYTHON_BOOT_LOADER = 'python-boot-loader'
 
 # Memory Content Types
 class MemoryContentTypes:
-    self.TEXT = 'text'
-    self.JSON = 'json'
-    self.BINARY = 'binary'
+    TEXT = 'text'
+    JSON = 'json'
+    BINARY = 'binary'
 
 # Memory Status
 class MemoryStatus:
-    self.IMPORTING = 'importing'
-    self.ANALYZING = 'analyzing'
-    self.PROCESSED = 'processed'
-    self.ERROR = 'error'
+    IMPORTING = 'importing'
+    ANALYZING = 'analyzing'
+    PROCESSED = 'processed'
+    ERROR = 'error'
 
 # Coherence Log Sources
 class CoherenceLogSources:
-    self.CALCULATOR = 'calculator'
-    self.API = 'api'
-    self.WEBSOCKET = 'websocket'
-    self.SYSTEM = 'system'
+    CALCULATOR = 'calculator'
+    API = 'api'
+    WEBSOCKET = 'websocket'
+    SYSTEM = 'system'
 
 # Memory model
 class Memory(SQLModel, table=True):
-    self.__tablename__ = "memories"
+    __tablename__ = "memories"
 
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str
@@ -60,10 +65,15 @@ class Memory(SQLModel, table=True):
     imported_by: str = Field(default="python")
     imported_at: datetime.datetime = Field(default_factory=datetime.datetime.now)
     updated_at: datetime.datetime = Field(default_factory=datetime.datetime.now)
+    content_hash: Optional[str] = Field(default=None, max_length=64)
+
+    __table_args__ = (
+        UniqueConstraint("source", "content_hash", name="ux_memories_source_content_hash"),
+    )
 
 # Coherence snapshot model
 class CoherenceSnapshot(SQLModel, table=True):
-    self.__tablename__ = "coherence_snapshots"
+    __tablename__ = "coherence_snapshots"
 
     id: Optional[int] = Field(default=None, primary_key=True)
     timestamp: datetime.datetime = Field(default_factory=datetime.datetime.now)
@@ -76,7 +86,7 @@ class CoherenceSnapshot(SQLModel, table=True):
 
 # Memory transaction model
 class MemoryTransaction(SQLModel, table=True):
-    self.__tablename__ = "memory_transactions"
+    __tablename__ = "memory_transactions"
 
     id: Optional[int] = Field(default=None, primary_key=True)
     timestamp: datetime.datetime = Field(default_factory=datetime.datetime.now)
@@ -89,7 +99,7 @@ class MemoryTransaction(SQLModel, table=True):
 
 # Coherence Log model
 class CoherenceLog(SQLModel, table=True):
-    self.__tablename__ = "coherence_logs"
+    __tablename__ = "coherence_logs"
 
     id: Optional[int] = Field(default=None, primary_key=True)
     timestamp: datetime.datetime = Field(default_factory=datetime.datetime.now)
@@ -102,21 +112,44 @@ class CoherenceLog(SQLModel, table=True):
 
 # API key model
 class ApiKey(SQLModel, table=True):
-    self.__tablename__ = "api_keys"
+    __tablename__ = "api_keys"
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    name: str
+    name: str = Field(unique=True)
     service: str
     key_identifier: str
     active: bool = Field(default=True)
     created_at: datetime.datetime = Field(default_factory=datetime.datetime.now)
     last_used_at: Optional[datetime.datetime] = None
 
+# Memory conversation model (one row per conversation of an imported export)
+class MemoryConversation(SQLModel, table=True):
+    __tablename__ = "memory_conversations"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    memory_id: int = Field(
+        sa_column=Column(Integer, ForeignKey("memories.id", ondelete="CASCADE"), nullable=False, index=True)
+    )
+    conversation_id: Optional[str] = None
+    title: Optional[str] = None
+    created_at: Optional[datetime.datetime] = None
+    content: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSONB))
+
+# Below this many conversations a plain ORM insert is cheaper than setting up COPY
+COPY_THRESHOLD = 100
+
 # Database helper functions
-def initialize_database():
-    """Create all tables in the database"""
+def initialize_database(seed_rows: Sequence[SQLModel] = ()):
+    """Create all tables in the database and insert any seed rows
+
+    DDL and seed inserts share one transaction, so startup pays for a single
+    BEGIN/COMMIT; several seed rows of a model go out as one batched INSERT.
+    """
     print("[QUANTUM_STATE: DATABASE_FLOW] Creating all tables in the database")
-    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        SQLModel.metadata.create_all(session.connection())
+        session.add_all(seed_rows)
+        session.commit()
     print("[QUANTUM_STATE: DATABASE_FLOW] All tables created successfully")
 
 def get_session():
@@ -132,26 +165,69 @@ def create_memory(memory: Memory):
         session.refresh(memory)
         return memory
 
+def content_digest(content) -> str:
+    """Hex digest used as Memory.content_hash (BLAKE2b, 32 bytes)"""
+    return hashlib.blake2b(content, digest_size=32).hexdigest()
+
+def create_memory_if_absent(memory: Memory, conversations: Sequence[Dict[str, Any]] = ()):
+    """Insert a memory unless one with the same source and content_hash exists
+
+    Uses INSERT ... ON CONFLICT (source, content_hash) DO NOTHING and returns
+    (memory, created); on a conflict the already stored memory is returned.
+    The conversations of a new memory are stored in the same transaction, so
+    a failed import leaves no memory behind to be reported as a duplicate.
+    """
+    values = {
+        column.name: getattr(memory, column.name)
+        for column in Memory.__table__.columns
+        if column.name != "id"
+    }
+    stmt = (
+        pg_insert(Memory)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=["source", "content_hash"])
+        .returning(Memory.id)
+    )
+    with get_session() as session:
+        memory_id = session.execute(stmt).scalar()
+        if memory_id is None:
+            existing = session.exec(
+                select(Memory).where(
+                    Memory.source == memory.source,
+                    Memory.content_hash == memory.content_hash,
+                )
+            ).one()
+            return existing, False
+        _insert_conversations(session, memory_id, conversations)
+        session.commit()
+        memory.id = memory_id
+        return memory, True
+
 def get_memory(memory_id: int):
     """Get a memory by ID"""
     with get_session() as session:
-        self.memory = session.get(Memory, memory_id)
+        memory = session.get(Memory, memory_id)
         return memory
 
 def get_memories(limit: int = 100, offset: int = 0, source: Optional[str] = None):
     """Get all memories with optional filtering"""
     with get_session() as session:
-        self.query = select(Memory)
+        query = select(Memory)
         if source:
-            self.query = query.filter(Memory.source == source)
-        self.query = query.offset(offset).limit(limit)
-        self.memories = session.exec(query).all()
+            query = query.filter(Memory.source == source)
+        query = query.offset(offset).limit(limit)
+        memories = session.exec(query).all()
         return memories
 
+def count_memories() -> int:
+    """Count memories with SELECT count(*) instead of loading the rows"""
+    with get_session() as session:
+        return session.exec(select(func.count()).select_from(Memory)).one()
+
 def update_memory(memory_id: int, **kwargs):
     """Update a memory by ID"""
     with get_session() as session:
-        self.memory = session.get(Memory, memory_id)
+        memory = session.get(Memory, memory_id)
         if not memory:
             return None
 
@@ -171,13 +247,92 @@ def update_memory(memory_id: int, **kwargs):
 def delete_memory(memory_id: int):
     """Delete a memory by ID"""
     with get_session() as session:
-        self.memory = session.get(Memory, memory_id)
+        memory = session.get(Memory, memory_id)
         if not memory:
             return False
         session.delete(memory)
         session.commit()
         return True
 
+# Memory conversation operations
+def _conversation_fields(conversation: Dict[str, Any]):
+    """Extract (conversation_id, title, created_at) from a ChatGPT export conversation"""
+    create_time = conversation.get("create_time")
+    created_at = datetime.datetime.fromtimestamp(create_time) if isinstance(create_time, (int, float)) else None
+    return conversation.get("id") or conversation.get("conversation_id"), conversation.get("title"), created_at
+
+def bulk_insert_conversations(memory_id: int, conversations: List[Dict[str, Any]]) -> int:
+    """Store the conversations of an imported export as memory_conversations rows"""
+    with get_session() as session:
+        _insert_conversations(session, memory_id, conversations)
+        session.commit()
+    return len(conversations)
+
+def _insert_conversations(session: Session, memory_id: int, conversations: Sequence[Dict[str, Any]]):
+    """Add memory_conversations rows in the session's transaction, without committing
+
+    Large exports go through PostgreSQL COPY in CSV format (tabs, newlines and
+    backslashes inside the JSON need no extra escaping there); exports with
+    fewer than COPY_THRESHOLD conversations use ORM inserts.
+    """
+    if len(conversations) < COPY_THRESHOLD:
+        for conversation in conversations:
+            conversation_id, title, created_at = _conversation_fields(conversation)
+            session.add(MemoryConversation(
+                memory_id=memory_id,
+                conversation_id=conversation_id,
+                title=title,
+                created_at=created_at,
+                content=conversation
+            ))
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for conversation in conversations:
+        conversation_id, title, created_at = _conversation_fields(conversation)
+        writer.writerow((
+            memory_id,
+            conversation_id,
+            title,
+            created_at.isoformat() if created_at else None,
+            orjson.dumps(conversation).decode()
+        ))
+    buffer.seek(0)
+
+    with session.connection().connection.cursor() as cursor:
+        cursor.copy_expert(
+            "COPY memory_conversations (memory_id, conversation_id, title, created_at, content) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+# API key operations
+def upsert_api_key(name: str, service: str, key_identifier: str):
+    """Create or replace the API key entry with the given name
+
+    A single INSERT ... ON CONFLICT (name) DO UPDATE, so repeated calls keep
+    one row per key name instead of appending a new row every time.
+    """
+    stmt = pg_insert(ApiKey).values(
+        name=name,
+        service=service,
+        key_identifier=key_identifier,
+        active=True,
+        created_at=datetime.datetime.now(),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ApiKey.name],
+        set_={
+            "service": stmt.excluded.service,
+            "key_identifier": stmt.excluded.key_identifier,
+            "active": True,
+        },
+    )
+    with get_session() as session:
+        session.execute(stmt)
+        session.commit()
+
 # Coherence snapshot operations
 def create_coherence_snapshot(snapshot: CoherenceSnapshot):
     """Create a new coherence snapshot"""
@@ -190,8 +345,8 @@ def create_coherence_snapshot(snapshot: CoherenceSnapshot):
 def get_latest_coherence_snapshot():
     """Get the latest coherence snapshot"""
     with get_session() as session:
-        self.query = select(CoherenceSnapshot).order_by(CoherenceSnapshot.timestamp.desc()).limit(1)
-        self.snapshots = session.exec(query).all()
+        query = select(CoherenceSnapshot).order_by(CoherenceSnapshot.timestamp.desc()).limit(1)
+        snapshots = session.exec(query).all()
         return snapshots[0] if snapshots else None
 
 # Transaction operations
@@ -206,20 +361,23 @@ def log_transaction(transaction: MemoryTransaction):
 def get_transactions(memory_id: Optional[int] = None, limit: int = 100):
     """Get transactions, optionally filtered by memory ID"""
     with get_session() as session:
-        self.query = select(MemoryTransaction)
+        query = select(MemoryTransaction)
         if memory_id:
-            self.query = query.filter(MemoryTransaction.memory_id == memory_id)
-        self.query = query.order_by(MemoryTransaction.timestamp.desc()).limit(limit)
-        self.transactions = session.exec(query).all()
+            query = query.filter(MemoryTransaction.memory_id == memory_id)
+        query = query.order_by(MemoryTransaction.timestamp.desc()).limit(limit)
+        transactions = session.exec(query).all()
         return transactions
 
 # Coherence log operations
 def log_coherence(log_entry: CoherenceLog):
-    """Create a new coherence log entry"""
-    with get_session() as session:
+    """Create a new coherence log entry
+
+    The generated id comes back through the INSERT's RETURNING clause and the
+    instance is not expired on commit, so no follow-up SELECT is issued.
+    """
+    with Session(engine, expire_on_commit=False) as session:
         session.add(log_entry)
         session.commit()
-        session.refresh(log_entry)
 
         # Note: We don't broadcast here to avoid circular imports
         # The calling code should handle broadcasting after this function returns
@@ -229,19 +387,43 @@ def log_coherence(log_entry: CoherenceLog):
 def get_coherence_logs(limit: int = 100, source: Optional[str] = None):
     """Get coherence logs, optionally filtered by source"""
     with get_session() as session:
-        self.query = select(CoherenceLog)
+        query = select(CoherenceLog)
         if source:
-            self.query = query.filter(CoherenceLog.source == source)
-        self.query = query.order_by(CoherenceLog.timestamp.desc()).limit(limit)
-        self.logs = session.exec(query).all()
+            query = query.filter(CoherenceLog.source == source)
+        query = query.order_by(CoherenceLog.timestamp.desc()).limit(limit)
+        logs = session.exec(query).all()
         return logs
 
+def get_coherence_log_rows(limit: int = 100, source: Optional[str] = None):
+    """Get coherence logs as plain mappings, newest first
+
+    The timestamp is converted to epoch milliseconds by Postgres
+    (EXTRACT(EPOCH FROM timestamp) * 1000) and returned as the int column
+    ts_ms, so no datetime objects are built or formatted per row.
+    """
+    ts_ms = (func.extract("epoch", CoherenceLog.timestamp) * 1000).cast(BigInteger).label("ts_ms")
+    query = select(
+        CoherenceLog.id,
+        ts_ms,
+        CoherenceLog.stability,
+        CoherenceLog.exploration,
+        CoherenceLog.ratio,
+        CoherenceLog.source,
+        CoherenceLog.context,
+        CoherenceLog.details
+    )
+    if source:
+        query = query.filter(CoherenceLog.source == source)
+    query = query.order_by(CoherenceLog.timestamp.desc()).limit(limit)
+    with get_session() as session:
+        return session.execute(query).mappings().all()
+
 def get_latest_coherence_log(source: Optional[str] = None):
     """Get the latest coherence log entry, optionally filtered by source"""
     with get_session() as session:
-        self.query = select(CoherenceLog)
+        query = select(CoherenceLog)
         if source:
-            self.query = query.filter(CoherenceLog.source == source)
-        self.query = query.order_by(CoherenceLog.timestamp.desc()).limit(1)
-        self.logs = session.exec(query).all()
+            query = query.filter(CoherenceLog.source == source)
+        query = query.order_by(CoherenceLog.timestamp.desc()).limit(1)
+        logs = session.exec(query).all()
         return logs[0] if logs else None
@@ -0,0 +1,42 @@
+"""unique api_keys name
+
+Revision ID: 7c1e4b2d9a30
+Revises: 255693985afe
+Create Date: 2025-04-24 10:12:41.208337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4b2d9a30'
+down_revision: Union[str, None] = '255693985afe'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    """Upgrade schema."""
+    # Keep only the newest row per name before adding the unique index
+    op.execute(
+        sa.text(
+            'DELETE FROM api_keys a USING api_keys b '
+            'WHERE a.name = b.name AND a.id < b.id'
+        )
+    )
+
+    # Unique index backing INSERT ... ON CONFLICT (name) DO UPDATE
+    op.create_index(
+        'ix_api_keys_name',
+        'api_keys',
+        ['name'],
+        unique=True
+    )
+
+
+def downgrade():
+    """Downgrade schema."""
+    op.drop_index('ix_api_keys_name', 'api_keys')
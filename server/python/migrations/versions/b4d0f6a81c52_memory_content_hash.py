@@ -0,0 +1,41 @@
+"""memories content_hash
+
+Revision ID: b4d0f6a81c52
+Revises: 7c1e4b2d9a30
+Create Date: 2025-04-24 16:03:55.917204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d0f6a81c52'
+down_revision: Union[str, None] = '7c1e4b2d9a30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    """Upgrade schema."""
+    # Digest of the imported content; NULL for memories that are not deduplicated
+    op.add_column(
+        'memories',
+        sa.Column('content_hash', sa.CHAR(64), nullable=True)
+    )
+
+    # Backs INSERT ... ON CONFLICT (source, content_hash) DO NOTHING on import
+    op.create_index(
+        'ux_memories_source_content_hash',
+        'memories',
+        ['source', 'content_hash'],
+        unique=True
+    )
+
+
+def downgrade():
+    """Downgrade schema."""
+    op.drop_index('ux_memories_source_content_hash', 'memories')
+    op.drop_column('memories', 'content_hash')
@@ -0,0 +1,51 @@
+"""add memory_conversations
+
+Revision ID: e9a27c5d3f18
+Revises: b4d0f6a81c52
+Create Date: 2025-04-24 17:42:09.301877
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9a27c5d3f18'
+down_revision: Union[str, None] = 'b4d0f6a81c52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    """Upgrade schema."""
+    # One row per conversation of an imported ChatGPT export, matching the
+    # MemoryConversation SQLModel (bulk-loaded with COPY on import)
+    op.create_table(
+        'memory_conversations',
+        sa.Column('id', sa.Integer(), nullable=False, primary_key=True),
+        sa.Column('memory_id', sa.Integer(), nullable=False),
+        sa.Column('conversation_id', sa.String(), nullable=True),
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('content', postgresql.JSONB(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        # Conversations go away with the memory they were imported with
+        sa.ForeignKeyConstraint(['memory_id'], ['memories.id'], ondelete='CASCADE')
+    )
+
+    # Conversations are always looked up by the memory they were imported with
+    op.create_index(
+        'ix_memory_conversations_memory_id',
+        'memory_conversations',
+        ['memory_id'],
+        unique=False
+    )
+
+
+def downgrade():
+    """Downgrade schema."""
+    op.drop_index('ix_memory_conversations_memory_id', 'memory_conversations')
+    op.drop_table('memory_conversations')
@@ -15,11 +15,15 @@ Integration with AI Agent:
 import os
 import asyncio
 import random
+import time
 import traceback
-from datetime import datetime
+import json
+import weakref
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timezone
 from functools import wraps
 import logging
-from typing import Dict, List, Any, Union
+from typing import Dict, List, Any, Optional, Union
 
 # Set up logging
 logging.basicConfig(level=logging.INFO,
@@ -30,12 +34,15 @@ logger = logging.getLogger("quantum-boot-loader")
 # since these libraries might not be installed yet
 try:
     import openai
-    from fastapi import FastAPI, WebSocket, BackgroundTasks, Request
+    from fastapi import FastAPI, WebSocket, BackgroundTasks, Request, Depends, HTTPException
     from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import Response
     from pydantic import BaseModel
+    import msgspec
+    import orjson
     import uvicorn
 except ImportError as e:
-    logger.error("Import error: {str(e)}. Please install missing packages.")
+    logger.error("Import error: %s. Please install missing packages.", e)
     print(f"Import error: {str(e)}. Please install missing packages.")
     raise
 
@@ -56,10 +63,11 @@ try:
         CoherenceLogSources,
         log_coherence,
         get_coherence_logs,
+        get_coherence_log_rows,
         get_latest_coherence_log
     )
 except ImportError as e:
-    logger.error("Database connector import error: {str(e)}")
+    logger.error("Database connector import error: %s", e)
     print(f"Database connector import error: {str(e)}")
     raise
 
@@ -75,113 +83,223 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Current connections - will store WebSocket connections
-active_connections = []
+# Current connections - will store WebSocket connections; sockets that are
+# garbage collected drop out of the set on their own
+active_connections: "weakref.WeakSet[WebSocket]" = weakref.WeakSet()
+
+# Reusable buffers for assembling ND-JSON responses; buffers larger than
+# _BUF_POOL_MAX_SIZE are dropped instead of being kept alive
+_BUF_POOL: List[bytearray] = []
+_BUF_POOL_MAX_SIZE = 1 << 20
 
 # Quantum coherence tracking
-coherence_state = {
-    "coherence_ratio": "3:1",  # Default 75% coherence, 25% exploration
-    "coherence_score": 75,
-    "stability_score": 75,
-    "exploration_score": 25,
-    "last_update": datetime.utcnow().isoformat()
-}
+@dataclass(frozen=True, slots=True)
+class CoherenceState:
+    """Immutable snapshot of the current coherence metrics
+
+    The module-level coherence_state is only ever replaced as a whole (see
+    update_coherence_state), so a reader that grabs it once always sees a
+    consistent set of fields without locking.
+    """
+    coherence_ratio: str = "3:1"  # Default 75% coherence, 25% exploration
+    coherence_score: int = 75
+    stability_score: int = 75
+    exploration_score: int = 25
+    last_update: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+coherence_state = CoherenceState()
+
+# Stability/exploration ratios inside this window count as an optimal 3:1 balance
+_OPT_LO, _OPT_HI = 2.9, 3.1
+
+def update_coherence_state(**changes) -> CoherenceState:
+    """Publish a new coherence state with the given fields changed"""
+    global coherence_state
+    coherence_state = replace(coherence_state, last_update=datetime.utcnow().isoformat(), **changes)
+    return coherence_state
+
+# Helper to express timestamps as epoch milliseconds
+def epoch_ms(moment=None) -> int:
+    """Convert a naive UTC datetime or ISO string (default: now) to epoch milliseconds"""
+    if moment is None:
+        return time.time_ns() // 1_000_000
+    if isinstance(moment, str):
+        moment = datetime.fromisoformat(moment)
+    return int(moment.replace(tzinfo=timezone.utc).timestamp() * 1000)
 
 # Helper function to get recent coherence logs
 def get_recent_coherence_logs(limit: int = 10, source: Optional[str] = None) -> List[Dict[str, Any]]:
     """Get recent coherence logs formatted as dictionaries
-    
+
     Args:
         limit: Maximum number of logs to return
         source: Optional filter by source
-        
+
     Returns:
-        List of coherence logs as dictionaries
+        List of coherence logs as dictionaries, with "timestamp" as
+        integer epoch milliseconds
     """
-    self.logs = get_coherence_logs(limit=limit, source=source)
-    self.log_dicts = []
-    
-    for log in logs:
-        self.log_dict = {
-            "id": log.id,
-            "timestamp": log.timestamp.isoformat() if hasattr(log.timestamp, 'isoformat') else str(log.timestamp),
-            "stability": log.stability,
-            "exploration": log.exploration,
-            "ratio": log.ratio,
-            "source": log.source,
-            "context": log.context,
-            "details": log.details
+    return [
+        {
+            "id": row["id"],
+            "timestamp": row["ts_ms"],
+            "stability": row["stability"],
+            "exploration": row["exploration"],
+            "ratio": row["ratio"],
+            "source": row["source"],
+            "context": row["context"],
+            "details": row["details"]
         }
-        log_dicts.append(log_dict)
-        
-    return log_dicts
+        for row in get_coherence_log_rows(limit=limit, source=source)
+    ]
 
-# Pydantic models
-class MemoryBase(BaseModel):
+# Request body models (decoded and validated straight from the raw body by msgspec)
+class MemoryBase(msgspec.Struct):
     title: str
     content: str
     content_type: str = MEMORY_CONTENT_TYPES["TEXT"]
     source: str = MEMORY_SOURCES["PYTHON_BOOT_LOADER"]
     status: str = MEMORY_STATUS["IMPORTING"]
-    memory_metadata: dict = {}
+    memory_metadata: dict = msgspec.field(default_factory=dict)
     imported_by: str = "python-boot-loader"
 
 class ApiKeyRequest(BaseModel):
     service: str
 
-class CoherenceSnapshotBase(BaseModel):
+class CoherenceSnapshotBase(msgspec.Struct):
     coherence_score: int
     stability_score: int
     exploration_score: int
-    snapshot_metadata: dict = {}
+    snapshot_metadata: dict = msgspec.field(default_factory=dict)
     source: str = "python-boot-loader"
     coherence_ratio: str = "3:1"
 
-# Helper function to broadcast messages to all connected clients
+def msgspec_body(model):
+    """Build a dependency that decodes the request body into a msgspec model"""
+    async def decode_body(request: Request):
+        try:
+            return msgspec.json.decode(await request.body(), type=model)
+        except msgspec.DecodeError as error:
+            raise HTTPException(status_code=422, detail=str(error))
+
+    return decode_body
+
+# Helper functions to broadcast messages to all connected clients
+async def broadcast_frame(frame: str):
+    """Send an already-encoded JSON frame to all connected WebSocket clients
+
+    Sends run concurrently; clients whose send fails are dropped from
+    active_connections instead of holding up the rest.
+    """
+    if not active_connections:
+        return
+
+    connections = list(active_connections)
+    results = await asyncio.gather(
+        *(connection.send_text(frame) for connection in connections),
+        return_exceptions=True
+    )
+    for connection, result in zip(connections, results):
+        if isinstance(result, Exception):
+            logger.error("Error broadcasting message, dropping client: %s", result)
+            active_connections.discard(connection)
+
 async def broadcast_message(message_type, data):
-    """Send a message to all connected WebSocket clients"""
+    """Send a message to all connected WebSocket clients
+
+    The message is serialized once and the same text frame is shared by
+    every connection.
+    """
     if not active_connections:
         return
 
-    self.message = {
+    frame = orjson.dumps({
         "type": message_type,
         "data": data,
         "timestamp": datetime.utcnow().isoformat()
-    }
+    }).decode()
+    await broadcast_frame(frame)
 
-    self.json_message = json.dumps(message)
-    for connection in active_connections:
-        try:
-            await connection.send_text(json_message)
-        except (TypeError, ValueError, AttributeError) as error:
-            logger.error("Error broadcasting message: {str(e)}")
+# Reads counted by @balance_read since the last flush, and how often they are flushed
+_read_count = 0
+READ_FLUSH_INTERVAL = 30
 
-# Decorator for quantum coherence tracking
-def maintain_quantum_balance(func):
-    """Decorator to track and maintain quantum coherence in function calls"""
+# Decorators for quantum coherence tracking
+def balance_read(func):
+    """Decorator for read-only endpoints: only counts the call
+
+    No state update, DB write or broadcast happens on the request path; the
+    counter is flushed periodically by flush_read_balance.
+    """
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        global _read_count
+        _read_count += 1
+        return await func(*args, **kwargs)
+
+    return wrapper
+
+async def flush_read_balance():
+    """Periodically record the reads counted by @balance_read as one coherence log"""
+    while True:
+        await asyncio.sleep(READ_FLUSH_INTERVAL)
+        await flush_read_count()
+
+async def flush_read_count():
+    """Record the reads counted since the last flush, if any, as one coherence log"""
+    global _read_count
+    if not _read_count:
+        return
+
+    reads, _read_count = _read_count, 0
+    try:
+        log_result = await asyncio.to_thread(log_coherence, CoherenceLog(
+            stability=0.75,
+            exploration=0.25,
+            ratio="3:1",
+            source=CoherenceLogSources.API,
+            context="balance_read",
+            details={
+                "reads": reads,
+                "interval_seconds": READ_FLUSH_INTERVAL,
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        ))
+        await broadcast_message("coherence_log", {
+            "id": log_result.id,
+            "timestamp": log_result.timestamp.isoformat(),
+            "stability": log_result.stability,
+            "exploration": log_result.exploration,
+            "ratio": log_result.ratio,
+            "source": log_result.source,
+            "context": log_result.context,
+            "details": log_result.details
+        })
+    except Exception as log_error:
+        logger.error("Failed to flush read balance: %s", log_error)
+
+def balance_write(func):
+    """Decorator to track and maintain quantum coherence in state-changing calls"""
     @wraps(func)
     async def wrapper(*args, **kwargs):
         # Get the function name for context
-        self.context = f"{func.__module__}.{func.__name__}"
-        # Apply stability factor (75%)
-        self.should_apply_stability = random.random() < 0.75
+        context = f"{func.__module__}.{func.__name__}"
 
         try:
             # Execute the function normally (stability path)
-            self.result = await func(*args, **kwargs)
+            result = await func(*args, **kwargs)
 
             # Update coherence metrics
-            coherence_state["coherence_score"] = int(0.75 * coherence_state["coherence_score"] + 0.25 * random.randint(70,
-                80))
-            coherence_state["stability_score"] = int(0.75 * coherence_state["stability_score"] + 0.25 * random.randint(70,
-                80))
-            coherence_state["exploration_score"] = int(0.75 * coherence_state["exploration_score"] + 0.25 * random.randint(20,
-                30))
-            coherence_state["last_update"] = datetime.utcnow().isoformat()
+            state = coherence_state
+            state = update_coherence_state(
+                coherence_score=int(0.75 * state.coherence_score + 0.25 * random.randint(70, 80)),
+                stability_score=int(0.75 * state.stability_score + 0.25 * random.randint(70, 80)),
+                exploration_score=int(0.75 * state.exploration_score + 0.25 * random.randint(20, 30))
+            )
 
             # Create a coherence log entry
             try:
-                self.log_entry = CoherenceLog(
+                log_entry = CoherenceLog(
                     stability=0.75,  # Exact values based on 3:1 ratio
                     exploration=0.25,
                     ratio="3:1",
@@ -190,18 +308,18 @@ def maintain_quantum_balance(func):
                     details={
                         "function": context,
                         "success": True,
-                        "coherence_score": coherence_state["coherence_score"],
-                        "stability_score": coherence_state["stability_score"],
-                        "exploration_score": coherence_state["exploration_score"],
+                        "coherence_score": state.coherence_score,
+                        "stability_score": state.stability_score,
+                        "exploration_score": state.exploration_score,
                         "timestamp": datetime.utcnow().isoformat()
                     }
                 )
                 # Log to database
-                self.log_result = log_coherence(log_entry)
+                log_result = log_coherence(log_entry)
 
                 # Also broadcast the coherence log to all WebSocket clients
                 if log_result:
-                    self.log_dict = {
+                    log_dict = {
                         "id": log_result.id,
                         "timestamp": log_result.timestamp.isoformat(),
                         "stability": log_result.stability,
@@ -213,26 +331,25 @@ def maintain_quantum_balance(func):
                     }
                     await broadcast_message("coherence_log", log_dict)
             except Exception as log_error:
-                logger.error("Failed to log coherence: {str(log_error)}")
+                logger.error("Failed to log coherence: %s", log_error)
 
             # Broadcast updated coherence metrics
-            await broadcast_message("coherence_update", coherence_state)
+            await broadcast_message("coherence_update", state)
 
             return result
 
         except (TypeError, ValueError, AttributeError) as error:
             # Update coherence metrics to show instability
-            coherence_state["coherence_score"] = int(0.75 * coherence_state["coherence_score"] + 0.25 * random.randint(40,
-                60))
-            coherence_state["stability_score"] = int(0.75 * coherence_state["stability_score"] + 0.25 * random.randint(40,
-                60))
-            coherence_state["exploration_score"] = int(0.75 * coherence_state["exploration_score"] + 0.25 * random.randint(30,
-                50))
-            coherence_state["last_update"] = datetime.utcnow().isoformat()
+            state = coherence_state
+            state = update_coherence_state(
+                coherence_score=int(0.75 * state.coherence_score + 0.25 * random.randint(40, 60)),
+                stability_score=int(0.75 * state.stability_score + 0.25 * random.randint(40, 60)),
+                exploration_score=int(0.75 * state.exploration_score + 0.25 * random.randint(30, 50))
+            )
 
             # Create a coherence log entry for errors
             try:
-                self.log_entry = CoherenceLog(
+                log_entry = CoherenceLog(
                     stability=0.60,  # Reduced stability during errors
                     exploration=0.40,  # Increased exploration during errors
                     ratio="3:2",     # Modified ratio during error states
@@ -241,19 +358,19 @@ def maintain_quantum_balance(func):
                     details={
                         "function": context,
                         "success": False,
-                        "error": str(e),
-                        "coherence_score": coherence_state["coherence_score"],
-                        "stability_score": coherence_state["stability_score"],
-                        "exploration_score": coherence_state["exploration_score"],
+                        "error": str(error),
+                        "coherence_score": state.coherence_score,
+                        "stability_score": state.stability_score,
+                        "exploration_score": state.exploration_score,
                         "timestamp": datetime.utcnow().isoformat()
                     }
                 )
                 # Log to database
-                self.log_result = log_coherence(log_entry)
+                log_result = log_coherence(log_entry)
 
                 # Also broadcast the coherence log to all WebSocket clients
                 if log_result:
-                    self.log_dict = {
+                    log_dict = {
                         "id": log_result.id,
                         "timestamp": log_result.timestamp.isoformat(),
                         "stability": log_result.stability,
@@ -265,10 +382,10 @@ def maintain_quantum_balance(func):
                     }
                     await broadcast_message("coherence_log", log_dict)
             except Exception as log_error:
-                logger.error("Failed to log coherence error: {str(log_error)}")
+                logger.error("Failed to log coherence error: %s", log_error)
 
             # Broadcast updated coherence metrics
-            await broadcast_message("coherence_update", coherence_state)
+            await broadcast_message("coherence_update", state)
 
             # Re-raise the exception
             raise
@@ -284,18 +401,18 @@ async def periodic_health_updates(websocket: WebSocket):
             await asyncio.sleep(5)
 
             # Get the same data as the health endpoint
-            self.db_connection = False
+            db_connection = False
             try:
-                self.db_connection = test_connection()
+                db_connection = test_connection()
             except:
                 pass
 
             # Get the latest coherence log
-            self.latest_log_dict = None
+            latest_log_dict = None
             try:
-                self.latest_log = get_latest_coherence_log()
+                latest_log = get_latest_coherence_log()
                 if latest_log:
-                    self.latest_log_dict = {
+                    latest_log_dict = {
                         "id": latest_log.id,
                         "timestamp": latest_log.timestamp.isoformat(),
                         "stability": latest_log.stability,
@@ -306,9 +423,9 @@ async def periodic_health_updates(websocket: WebSocket):
                         "details": latest_log.details
                     }
             except Exception as log_error:
-                logger.error("Error retrieving latest coherence log: {str(log_error)}")
+                logger.error("Error retrieving latest coherence log: %s", log_error)
 
-            self.health_data = {
+            health_data = {
                 "status": "healthy" if db_connection else "degraded",
                 "database_connection": db_connection,
                 "coherence": {
@@ -331,20 +448,20 @@ async def periodic_health_updates(websocket: WebSocket):
                 }))
             except (TypeError, ValueError, AttributeError) as error:
                 # If we can't send, client is probably disconnected
-                logger.error("Error sending health update: {str(e)}")
+                logger.error("Error sending health update: %s", error)
                 break
 
     except (TypeError, ValueError, AttributeError) as error:
-        logger.error("Error in periodic health updates: {str(e)}")
+        logger.error("Error in periodic health updates: %s", error)
 
 # WebSocket endpoint
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    active_connections.append(websocket)
+    active_connections.add(websocket)
 
     # Start the periodic health updates task
-    self.health_task = asyncio.create_task(periodic_health_updates(websocket))
+    health_task = asyncio.create_task(periodic_health_updates(websocket))
 
     try:
         # Send welcome message
@@ -352,19 +469,19 @@ async def websocket_endpoint(websocket: WebSocket):
             "type": "system",
             "data": {
                 "message": "Connected to WiltonOS Quantum Boot Loader",
-                "coherence": coherence_state
+                "coherence": asdict(coherence_state)
             },
             "timestamp": datetime.utcnow().isoformat()
         }))
 
         # Main message loop
         while True:
-            self.data = await websocket.receive_text()
+            data = await websocket.receive_text()
 
             try:
-                self.message = json.loads(data)
-                self.message_type = message.get("type", "unknown")
-                self.message_data = message.get("data", {})
+                message = json.loads(data)
+                message_type = message.get("type", "unknown")
+                message_data = message.get("data", {})
 
                 if message_type == "ping":
                     # Respond to ping
@@ -380,8 +497,8 @@ async def websocket_endpoint(websocket: WebSocket):
                 if message_type == "import_memory":
                     # Import memory
                     try:
-                        self.memory_data = message_data
-                        self.imported_memory = import_memory(memory_data)
+                        memory_data = message_data
+                        imported_memory = import_memory(memory_data)
 
                         await websocket.send_text(json.dumps({
                             "type": "memory_imported",
@@ -400,8 +517,8 @@ async def websocket_endpoint(websocket: WebSocket):
                         })
 
                     except (TypeError, ValueError, AttributeError) as error:
-                        self.error_details = str(e)
-                        logger.error("Memory import error: {error_details}")
+                        error_details = str(error)
+                        logger.error("Memory import error: %s", error_details)
 
                         await websocket.send_text(json.dumps({
                             "type": "error",
@@ -415,11 +532,11 @@ async def websocket_endpoint(websocket: WebSocket):
                 if message_type == "get_memory":
                     # Get memory by ID
                     try:
-                        self.memory_id = message_data.get("id")
+                        memory_id = message_data.get("id")
                         if not memory_id:
                             raise ValueError("Memory ID is required")
 
-                        self.memory = get_memory(memory_id)
+                        memory = get_memory(memory_id)
 
                         await websocket.send_text(json.dumps({
                             "type": "memory_retrieved",
@@ -430,8 +547,8 @@ async def websocket_endpoint(websocket: WebSocket):
                         }))
 
                     except (TypeError, ValueError, AttributeError) as error:
-                        self.error_details = str(e)
-                        logger.error("Memory retrieval error: {error_details}")
+                        error_details = str(error)
+                        logger.error("Memory retrieval error: %s", error_details)
 
                         await websocket.send_text(json.dumps({
                             "type": "error",
@@ -446,20 +563,19 @@ async def websocket_endpoint(websocket: WebSocket):
                     # Create coherence snapshot
                     try:
                         # Ensure field names match database structure (metadata → snapshot_metadata)
-                        self.snapshot_data = message_data
+                        snapshot_data = message_data
                         if "metadata" in snapshot_data and "snapshot_metadata" not in snapshot_data:
                             snapshot_data["snapshot_metadata"] = snapshot_data.pop("metadata")
 
-                        self.snapshot = create_coherence_snapshot(snapshot_data)
+                        snapshot = create_coherence_snapshot(snapshot_data)
 
                         # Update local coherence state
-                        coherence_state["coherence_score"] = snapshot_data.get("coherence_score",
-                            coherence_state["coherence_score"])
-                        coherence_state["stability_score"] = snapshot_data.get("stability_score",
-                            coherence_state["stability_score"])
-                        coherence_state["exploration_score"] = snapshot_data.get("exploration_score",
-                            coherence_state["exploration_score"])
-                        coherence_state["last_update"] = datetime.utcnow().isoformat()
+                        state = coherence_state
+                        state = update_coherence_state(
+                            coherence_score=snapshot_data.get("coherence_score", state.coherence_score),
+                            stability_score=snapshot_data.get("stability_score", state.stability_score),
+                            exploration_score=snapshot_data.get("exploration_score", state.exploration_score)
+                        )
 
                         await websocket.send_text(json.dumps({
                             "type": "coherence_snapshot_created",
@@ -471,11 +587,11 @@ async def websocket_endpoint(websocket: WebSocket):
                         }))
 
                         # Also broadcast to all clients
-                        await broadcast_message("coherence_update", coherence_state)
+                        await broadcast_message("coherence_update", state)
 
                     except (TypeError, ValueError, AttributeError) as error:
-                        self.error_details = str(e)
-                        logger.error("Coherence snapshot creation error: {error_details}")
+                        error_details = str(error)
+                        logger.error("Coherence snapshot creation error: %s", error_details)
 
                         await websocket.send_text(json.dumps({
                             "type": "error",
@@ -489,11 +605,11 @@ async def websocket_endpoint(websocket: WebSocket):
                 if message_type == "get_api_key":
                     # Get API key for service
                     try:
-                        self.service = message_data.get("service")
+                        service = message_data.get("service")
                         if not service:
                             raise ValueError("Service name is required")
 
-                        self.api_key = get_active_api_key(service)
+                        api_key = get_active_api_key(service)
 
                         await websocket.send_text(json.dumps({
                             "type": "api_key_retrieved",
@@ -505,8 +621,8 @@ async def websocket_endpoint(websocket: WebSocket):
                         }))
 
                     except (TypeError, ValueError, AttributeError) as error:
-                        self.error_details = str(e)
-                        logger.error("API key retrieval error: {error_details}")
+                        error_details = str(error)
+                        logger.error("API key retrieval error: %s", error_details)
 
                         await websocket.send_text(json.dumps({
                             "type": "error",
@@ -520,7 +636,7 @@ async def websocket_endpoint(websocket: WebSocket):
                 if message_type == "test_database":
                     # Test database connection
                     try:
-                        self.connection_result = test_connection()
+                        connection_result = test_connection()
 
                         await websocket.send_text(json.dumps({
                             "type": "database_test_result",
@@ -532,8 +648,8 @@ async def websocket_endpoint(websocket: WebSocket):
                         }))
 
                     except (TypeError, ValueError, AttributeError) as error:
-                        self.error_details = str(e)
-                        logger.error("Database test error: {error_details}")
+                        error_details = str(error)
+                        logger.error("Database test error: %s", error_details)
 
                         await websocket.send_text(json.dumps({
                             "type": "error",
@@ -547,11 +663,11 @@ async def websocket_endpoint(websocket: WebSocket):
                 if message_type == "get_coherence_logs":
                     # Get coherence logs
                     try:
-                        self.limit = message_data.get("limit", 100)
-                        self.source = message_data.get("source")
+                        limit = message_data.get("limit", 100)
+                        source = message_data.get("source")
 
-                        self.logs = get_coherence_logs(limit=limit, source=source)
-                        self.logs_dict = []
+                        logs = get_coherence_logs(limit=limit, source=source)
+                        logs_dict = []
 
                         for log in logs:
                             logs_dict.append({
@@ -575,8 +691,8 @@ async def websocket_endpoint(websocket: WebSocket):
                         }))
 
                     except (TypeError, ValueError, AttributeError) as error:
-                        self.error_details = str(e)
-                        logger.error("Coherence logs retrieval error: {error_details}")
+                        error_details = str(error)
+                        logger.error("Coherence logs retrieval error: %s", error_details)
 
                         await websocket.send_text(json.dumps({
                             "type": "error",
@@ -590,9 +706,9 @@ async def websocket_endpoint(websocket: WebSocket):
                 if message_type == "get_latest_coherence_log":
                     # Get latest coherence log
                     try:
-                        self.source = message_data.get("source")
+                        source = message_data.get("source")
 
-                        self.log = get_latest_coherence_log(source=source)
+                        log = get_latest_coherence_log(source=source)
 
                         if not log:
                             await websocket.send_text(json.dumps({
@@ -604,7 +720,7 @@ async def websocket_endpoint(websocket: WebSocket):
                                 "timestamp": datetime.utcnow().isoformat()
                             }))
                         else:
-                            self.log_dict = {
+                            log_dict = {
                                 "id": log.id,
                                 "timestamp": log.timestamp.isoformat(),
                                 "stability": log.stability,
@@ -624,8 +740,8 @@ async def websocket_endpoint(websocket: WebSocket):
                             }))
 
                     except (TypeError, ValueError, AttributeError) as error:
-                        self.error_details = str(e)
-                        logger.error("Latest coherence log retrieval error: {error_details}")
+                        error_details = str(error)
+                        logger.error("Latest coherence log retrieval error: %s", error_details)
 
                         await websocket.send_text(json.dumps({
                             "type": "error",
@@ -658,8 +774,8 @@ async def websocket_endpoint(websocket: WebSocket):
 
             except (TypeError, ValueError, AttributeError) as error:
                 # General error
-                self.error_details = str(e)
-                logger.error("WebSocket message processing error: {error_details}")
+                error_details = str(error)
+                logger.error("WebSocket message processing error: %s", error_details)
 
                 await websocket.send_text(json.dumps({
                     "type": "error",
@@ -672,18 +788,17 @@ async def websocket_endpoint(websocket: WebSocket):
 
     except (TypeError, ValueError, AttributeError) as error:
         # Connection error
-        logger.error("WebSocket connection error: {str(e)}")
+        logger.error("WebSocket connection error: %s", error)
 
     finally:
         # Clean up
-        if websocket in active_connections:
-            active_connections.remove(websocket)
+        active_connections.discard(websocket)
 
         # Cancel the health updates task
         try:
             health_task.cancel()
         except (TypeError, ValueError, AttributeError) as error:
-            logger.error("Error canceling health task: {str(e)}")
+            logger.error("Error canceling health task: %s", error)
 
 # REST API endpoints
 @app.get("/")
@@ -700,9 +815,9 @@ async def root():
 async def health_check():
     """Health check endpoint"""
     # Test database connection
-    self.db_connection = False
+    db_connection = False
     try:
-        self.db_connection = test_connection()
+        db_connection = test_connection()
     except:
         pass
 
@@ -718,106 +833,106 @@ async def health_check():
 async def metrics_endpoint(last: int = 10, diff_threshold: float = 0.01):
     """
     Get recent coherence metrics as ND-JSON stream
-    
+
+    Each line's "timestamp" is an integer number of milliseconds since the
+    Unix epoch (UTC), ready for `new Date(ms)` on the JavaScript side.
+
     Args:
         last: Number of most recent metrics to return (default 10)
         diff_threshold: Minimum difference threshold between consecutive metrics (default 0.01)
     """
-    from fastapi.responses import StreamingResponse
-    import io
-    
     try:
         # Get recent coherence logs from database
-        self.logs = get_recent_coherence_logs(limit=last)
+        logs = get_recent_coherence_logs(limit=last)
         
         # If no logs are found, just return the current coherence state
         if not logs:
-            self.current_metric = {
-                "stability": coherence_state["stability_score"] / 100,
-                "exploration": coherence_state["exploration_score"] / 100,
-                "ratio": coherence_state["coherence_ratio"],
-                "timestamp": coherence_state["last_update"],
+            state = coherence_state
+            current_metric = {
+                "stability": state.stability_score / 100,
+                "exploration": state.exploration_score / 100,
+                "ratio": state.coherence_ratio,
+                "timestamp": epoch_ms(state.last_update),
                 "source": "current_state"
             }
-            return StreamingResponse(
-                io.StringIO(json.dumps(current_metric) + "\n"),
-                media_type="application/x-ndjson"
-            )
+            return Response(orjson.dumps(current_metric) + b"\n", media_type="application/x-ndjson")
         
         # Filter logs based on diff_threshold
-        self.filtered_logs = []
-        self.prev_stability = None
-        self.prev_exploration = None
+        filtered_logs = []
+        prev_stability = None
+        prev_exploration = None
         
         for log in logs:
-            self.stability = log.get("stability", 0.75)
-            self.exploration = log.get("exploration", 0.25)
+            stability = log.get("stability", 0.75)
+            exploration = log.get("exploration", 0.25)
             
             # Always include the first log
             if prev_stability is None or prev_exploration is None:
                 filtered_logs.append(log)
-                self.prev_stability = stability
-                self.prev_exploration = exploration
+                prev_stability = stability
+                prev_exploration = exploration
                 continue
             
             # Check if difference exceeds threshold
-            self.stability_diff = abs(stability - prev_stability)
-            self.exploration_diff = abs(exploration - prev_exploration)
+            stability_diff = abs(stability - prev_stability)
+            exploration_diff = abs(exploration - prev_exploration)
             
             if stability_diff > diff_threshold or exploration_diff > diff_threshold:
                 filtered_logs.append(log)
-                self.prev_stability = stability
-                self.prev_exploration = exploration
+                prev_stability = stability
+                prev_exploration = exploration
         
-        # Convert logs to ND-JSON format
-        self.response_content = ""
+        # Convert logs to ND-JSON format in a pooled buffer
+        buf = _BUF_POOL.pop() if _BUF_POOL else bytearray()
+        buf.clear()
         for log in filtered_logs:
-            response_content += json.dumps({
+            buf += orjson.dumps({
                 "stability": log.get("stability", 0.75),
                 "exploration": log.get("exploration", 0.25),
                 "ratio": log.get("ratio", "3.0:1"),
-                "timestamp": log.get("timestamp", datetime.utcnow().isoformat()),
+                "timestamp": log.get("timestamp") or epoch_ms(),
                 "context": log.get("context", "system")
-            }) + "\n"
-        
-        return StreamingResponse(
-            io.StringIO(response_content),
-            media_type="application/x-ndjson"
-        )
-        
+            })
+            buf.append(0x0A)
+
+        response_content = bytes(buf)
+        if len(buf) < _BUF_POOL_MAX_SIZE:
+            _BUF_POOL.append(buf)
+
+        return Response(response_content, media_type="application/x-ndjson")
+
     except (TypeError, ValueError, AttributeError) as error:
         # In case of error, return a single metric with the current state
-        self.error_metric = {
-            "stability": coherence_state["stability_score"] / 100,
-            "exploration": coherence_state["exploration_score"] / 100,
-            "ratio": coherence_state["coherence_ratio"],
-            "timestamp": datetime.utcnow().isoformat(),
-            "error": str(e)
+        state = coherence_state
+        error_metric = {
+            "stability": state.stability_score / 100,
+            "exploration": state.exploration_score / 100,
+            "ratio": state.coherence_ratio,
+            "timestamp": epoch_ms(),
+            "error": str(error)
         }
         
-        return StreamingResponse(
-            io.StringIO(json.dumps(error_metric) + "\n"),
-            media_type="application/x-ndjson"
-        )
+        return Response(orjson.dumps(error_metric) + b"\n", media_type="application/x-ndjson")
 
 @app.get("/health-check")
 async def node_js_health_check():
     """Enhanced health check endpoint specifically for Node.js integration
     with quantum balance monitoring (3:1 ratio)"""
     # Test database connection
-    self.db_connection = False
+    db_connection = False
     try:
-        self.db_connection = test_connection()
+        db_connection = test_connection()
         if db_connection:
             logger.info("[QUANTUM_STATE: DATABASE_FLOW] PostgreSQL connection successful from Python - quantum coherence maintained")
     except (TypeError, ValueError, AttributeError) as error:
-        logger.error("[QUANTUM_STATE: ERROR_FLOW] Database connection failed in health check: {str(e)}")
+        logger.error("[QUANTUM_STATE: ERROR_FLOW] Database connection failed in health check: %s", error)
 
     # Calculate and verify quantum balance
-    self.stability_ratio = coherence_state["stability_score"] / 100
-    self.exploration_ratio = coherence_state["exploration_score"] / 100
-    self.balance_ratio = stability_ratio / (exploration_ratio if exploration_ratio > 0 else 0.01)
-    self.balance_status = "optimal" if 2.9 <= balance_ratio <= 3.1 else "adjusting"
+    state = coherence_state
+    stability_ratio = state.stability_score / 100
+    exploration_ratio = state.exploration_score / 100
+    balance_ratio = stability_ratio / max(exploration_ratio, 0.01)
+    balance_status = "optimal" if _OPT_LO <= balance_ratio <= _OPT_HI else "adjusting"
 
     return {
         "service": "WiltonOS Python Quantum Boot-Loader",
@@ -829,9 +944,9 @@ async def node_js_health_check():
             "target_ratio": "3:1",
             "actual_ratio": f"{balance_ratio:.2f}:1",
             "status": balance_status,
-            "coherence_score": coherence_state["coherence_score"],
-            "stability_score": coherence_state["stability_score"],
-            "exploration_score": coherence_state["exploration_score"]
+            "coherence_score": state.coherence_score,
+            "stability_score": state.stability_score,
+            "exploration_score": state.exploration_score
         },
         "integrations": {
             "node_js": True,
@@ -841,15 +956,15 @@ async def node_js_health_check():
     }
 
 @app.post("/memories")
-@maintain_quantum_balance
-async def create_memory(memory: MemoryBase):
+@balance_write
+async def create_memory(memory: MemoryBase = Depends(msgspec_body(MemoryBase))):
     """Create a new memory"""
     try:
-        # Convert Pydantic model to dict
-        self.memory_data = memory.dict()
+        # Convert the msgspec struct to builtins in a single pass
+        memory_data = msgspec.to_builtins(memory)
 
         # Import memory using the database connector
-        self.imported_memory = import_memory(memory_data)
+        imported_memory = import_memory(memory_data)
 
         # Broadcast to all WebSocket clients
         await broadcast_message("memory_imported", {
@@ -865,8 +980,8 @@ async def create_memory(memory: MemoryBase):
         }
 
     except (TypeError, ValueError, AttributeError) as error:
-        self.error_details = str(e)
-        logger.error("REST API memory import error: {error_details}")
+        error_details = str(error)
+        logger.error("REST API memory import error: %s", error_details)
 
         return {
             "success": False,
@@ -875,11 +990,11 @@ async def create_memory(memory: MemoryBase):
         }
 
 @app.get("/memories/{memory_id}")
-@maintain_quantum_balance
+@balance_read
 async def get_memory_by_id(memory_id: int):
     """Get a memory by ID"""
     try:
-        self.memory = get_memory(memory_id)
+        memory = get_memory(memory_id)
 
         return {
             "success": True,
@@ -887,8 +1002,8 @@ async def get_memory_by_id(memory_id: int):
         }
 
     except (TypeError, ValueError, AttributeError) as error:
-        self.error_details = str(e)
-        logger.error("REST API memory retrieval error: {error_details}")
+        error_details = str(error)
+        logger.error("REST API memory retrieval error: %s", error_details)
 
         return {
             "success": False,
@@ -897,24 +1012,26 @@ async def get_memory_by_id(memory_id: int):
         }
 
 @app.post("/coherence-snapshots")
-@maintain_quantum_balance
-async def create_coherence_snapshot_endpoint(snapshot: CoherenceSnapshotBase):
+@balance_write
+async def create_coherence_snapshot_endpoint(
+        snapshot: CoherenceSnapshotBase = Depends(msgspec_body(CoherenceSnapshotBase))):
     """Create a new coherence snapshot"""
     try:
-        # Convert Pydantic model to dict and ensure field names match database structure
-        self.snapshot_data = snapshot.dict()
+        # Convert the msgspec struct to a dict matching the database structure
+        snapshot_data = msgspec.to_builtins(snapshot)
 
         # Create snapshot using the database connector
-        self.created_snapshot = create_coherence_snapshot(snapshot_data)
+        created_snapshot = create_coherence_snapshot(snapshot_data)
 
-        # Update local coherence state
-        coherence_state["coherence_score"] = snapshot.coherence_score
-        coherence_state["stability_score"] = snapshot.stability_score
-        coherence_state["exploration_score"] = snapshot.exploration_score
-        coherence_state["last_update"] = datetime.utcnow().isoformat()
+        # Update local coherence state from the same dict
+        state = update_coherence_state(
+            coherence_score=snapshot_data["coherence_score"],
+            stability_score=snapshot_data["stability_score"],
+            exploration_score=snapshot_data["exploration_score"]
+        )
 
         # Broadcast to all WebSocket clients
-        await broadcast_message("coherence_update", coherence_state)
+        await broadcast_message("coherence_update", state)
 
         return {
             "success": True,
@@ -923,8 +1040,8 @@ async def create_coherence_snapshot_endpoint(snapshot: CoherenceSnapshotBase):
         }
 
     except (TypeError, ValueError, AttributeError) as error:
-        self.error_details = str(e)
-        logger.error("REST API coherence snapshot creation error: {error_details}")
+        error_details = str(error)
+        logger.error("REST API coherence snapshot creation error: %s", error_details)
 
         return {
             "success": False,
@@ -933,14 +1050,14 @@ async def create_coherence_snapshot_endpoint(snapshot: CoherenceSnapshotBase):
         }
 
 @app.get("/coherence-logs")
-@maintain_quantum_balance
+@balance_read
 async def get_coherence_logs_endpoint(limit: int = 100, source: Optional[str] = None):
     """Get coherence logs with optional filtering by source"""
     try:
-        self.logs = get_coherence_logs(limit=limit, source=source)
-        self.logs_dict = []
+        logs = get_coherence_logs(limit=limit, source=source)
+        logs_dict = []
         for log in logs:
-            self.log_dict = {
+            log_dict = {
                 "id": log.id,
                 "timestamp": log.timestamp.isoformat(),
                 "stability": log.stability,
@@ -959,8 +1076,8 @@ async def get_coherence_logs_endpoint(limit: int = 100, source: Optional[str] =
         }
 
     except (TypeError, ValueError, AttributeError) as error:
-        self.error_details = str(e)
-        logger.error("REST API coherence logs retrieval error: {error_details}")
+        error_details = str(error)
+        logger.error("REST API coherence logs retrieval error: %s", error_details)
 
         return {
             "success": False,
@@ -969,44 +1086,33 @@ async def get_coherence_logs_endpoint(limit: int = 100, source: Optional[str] =
         }
 
 @app.get("/coherence-logs/latest")
-@maintain_quantum_balance
-async def get_latest_coherence_log_endpoint(source: Optional[str] = None):
-    """Get the latest coherence log entry, optionally filtered by source"""
-    try:
-        # First, create a new test coherence log entry
-        self.test_log_entry = CoherenceLog(
-            stability=0.75,  # Exact values based on 3:1 ratio
-            exploration=0.25,
-            ratio="3:1",
-            source=source or CoherenceLogSources.SYSTEM,
-            context="API /coherence-logs/latest endpoint call",
-            details={
-                "function": "get_latest_coherence_log_endpoint",
-                "success": True,
-                "test": True,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-        )
+@balance_read
+async def get_latest_coherence_log_endpoint(source: Optional[str] = None, probe: bool = False):
+    """Get the latest coherence log entry, optionally filtered by source
 
-        # Log to database (this call is now also broadcasting via the maintain_quantum_balance decorator)
-        self.created_log = log_coherence(test_log_entry)
-
-        # Explicitly broadcast this log entry to all WebSocket clients
-        if created_log:
-            self.log_data = {
-                "id": created_log.id,
-                "timestamp": created_log.timestamp.isoformat(),
-                "stability": created_log.stability,
-                "exploration": created_log.exploration,
-                "ratio": created_log.ratio,
-                "source": created_log.source,
-                "context": created_log.context,
-                "details": created_log.details
-            }
-            await broadcast_message("test_coherence_log", log_data)
+    With probe=true a test coherence log is written first, broadcast to all
+    WebSocket clients and returned directly from the insert.
+    """
+    try:
+        if probe:
+            test_log_entry = CoherenceLog(
+                stability=0.75,  # Exact values based on 3:1 ratio
+                exploration=0.25,
+                ratio="3:1",
+                source=source or CoherenceLogSources.SYSTEM,
+                context="API /coherence-logs/latest endpoint call",
+                details={
+                    "function": "get_latest_coherence_log_endpoint",
+                    "success": True,
+                    "test": True,
+                    "timestamp": datetime.utcnow().isoformat()
+                }
+            )
 
-        # Now get the latest log (which should be our new test log)
-        self.log = get_latest_coherence_log(source=source)
+            # The inserted row is the latest log, no need to read it back
+            log = log_coherence(test_log_entry)
+        else:
+            log = get_latest_coherence_log(source=source)
 
         if not log:
             return {
@@ -1015,7 +1121,7 @@ async def get_latest_coherence_log_endpoint(source: Optional[str] = None):
                 "message": "No coherence logs found"
             }
 
-        self.log_dict = {
+        log_dict = {
             "id": log.id,
             "timestamp": log.timestamp.isoformat(),
             "stability": log.stability,
@@ -1026,6 +1132,15 @@ async def get_latest_coherence_log_endpoint(source: Optional[str] = None):
             "details": log.details
         }
 
+        if not probe:
+            return {
+                "success": True,
+                "log": log_dict
+            }
+
+        # Explicitly broadcast the test log entry to all WebSocket clients
+        await broadcast_message("test_coherence_log", log_dict)
+
         return {
             "success": True,
             "log": log_dict,
@@ -1033,8 +1148,8 @@ async def get_latest_coherence_log_endpoint(source: Optional[str] = None):
         }
 
     except (TypeError, ValueError, AttributeError) as error:
-        self.error_details = str(e)
-        logger.error("REST API latest coherence log retrieval error: {error_details}")
+        error_details = str(error)
+        logger.error("REST API latest coherence log retrieval error: %s", error_details)
 
         return {
             "success": False,
@@ -1043,11 +1158,11 @@ async def get_latest_coherence_log_endpoint(source: Optional[str] = None):
         }
 
 @app.post("/api-keys/get")
-@maintain_quantum_balance
+@balance_read
 async def get_api_key_endpoint(request: ApiKeyRequest):
     """Get an API key for a service"""
     try:
-        self.api_key = get_active_api_key(request.service)
+        api_key = get_active_api_key(request.service)
 
         if not api_key:
             return {
@@ -1062,8 +1177,8 @@ async def get_api_key_endpoint(request: ApiKeyRequest):
         }
 
     except (TypeError, ValueError, AttributeError) as error:
-        self.error_details = str(e)
-        logger.error("REST API API key retrieval error: {error_details}")
+        error_details = str(error)
+        logger.error("REST API API key retrieval error: %s", error_details)
 
         return {
             "success": False,
@@ -1071,21 +1186,28 @@ async def get_api_key_endpoint(request: ApiKeyRequest):
             "details": error_details
         }
 
+# Background task flushing the @balance_read counter
+_read_flush_task = None
+
 # Startup event to initialize and test database connection
 @app.on_event("startup")
 async def startup_event():
     """Run at application startup"""
+    global _read_flush_task
     logger.info("Starting WiltonOS Quantum Boot Loader")
 
+    # Flush the read counter of @balance_read endpoints in the background
+    _read_flush_task = asyncio.create_task(flush_read_balance())
+
     # Test database connection
     try:
-        self.connection_result = test_connection()
+        connection_result = test_connection()
         if connection_result:
             logger.info("Database connection test successful")
         else:
             logger.error("Database connection test failed")
     except (TypeError, ValueError, AttributeError) as error:
-        logger.error("Database connection error: {str(e)}")
+        logger.error("Database connection error: %s", error)
 
     # Initialize AI agent if in embedded mode
     if os.environ.get("AGENT_EMBEDDED", "1") == "1":
@@ -1101,20 +1223,44 @@ async def startup_event():
 
             logger.info("AI Agent initialized in embedded mode and mounted at /ai")
         except ImportError as e:
-            logger.error("Failed to initialize AI agent in embedded mode: {str(e)}")
+            logger.error("Failed to initialize AI agent in embedded mode: %s", e)
         except (TypeError, ValueError, AttributeError) as error:
-            logger.error("AI agent initialization error: {str(e)}")
+            logger.error("AI agent initialization error: %s", error)
+
+# Shutdown event: stop the background flush and record the pending reads
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Run at application shutdown"""
+    if _read_flush_task is not None:
+        _read_flush_task.cancel()
+        try:
+            await _read_flush_task
+        except asyncio.CancelledError:
+            pass
+    await flush_read_count()
 
 # Run the server if executed directly
 if __name__ == "__main__":
     # Set port to 8765 as specified in task requirements
-    self.port = int(os.environ.get("PYTHON_PORT", 8765))
+    port = int(os.environ.get("PYTHON_PORT", 8765))
 
     # Log startup information
-    logger.info("[QUANTUM_STATE: STARTUP_FLOW] Starting WiltonOS Quantum Boot Loader on port {port}")
-    logger.info("[QUANTUM_STATE: STARTUP_FLOW] REST API available at http://localhost:{port}/health")
-    logger.info("[QUANTUM_STATE: STARTUP_FLOW] WebSocket endpoint available at ws://localhost:{port}/ws")
+    logger.info("[QUANTUM_STATE: STARTUP_FLOW] Starting WiltonOS Quantum Boot Loader on port %s", port)
+    logger.info("[QUANTUM_STATE: STARTUP_FLOW] REST API available at http://localhost:%s/health", port)
+    logger.info("[QUANTUM_STATE: STARTUP_FLOW] WebSocket endpoint available at ws://localhost:%s/ws", port)
     logger.info("[QUANTUM_STATE: STARTUP_FLOW] Maintaining strict 3:1 quantum balance ratio")
 
-    # Run the FastAPI app with Uvicorn (includes WebSocket handling)
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Run the FastAPI app with Uvicorn (includes WebSocket handling); "auto"
+    # picks uvloop and httptools when they are installed and falls back to
+    # asyncio and h11 otherwise. Coherence state and WebSocket clients live
+    # in-process, so extra workers (WEB_CONCURRENCY) each get their own copy
+    # of both.
+    uvicorn.run(
+        "quantum_boot_loader:app",
+        host="0.0.0.0",
+        port=port,
+        loop="auto",
+        http="auto",
+        workers=int(os.environ.get("WEB_CONCURRENCY", 1)),
+        log_level="warning"
+    )
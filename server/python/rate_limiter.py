@@ -0,0 +1,286 @@
+"""
+WiltonOS Rate Limiter – pure ASGI token bucket
+----------------------------------------------
+Per-client, per-route token buckets applied as a plain ASGI middleware, so a
+limited request costs one dict lookup and never builds a Starlette Request.
+Limits keep the quantum balance profile of the endpoints (stability routes get
+more headroom than exploration routes, see README_RATE_LIMITING.md).
+"""
+from __future__ import annotations
+
+import math
+import socket
+import threading
+import time
+from array import array
+from typing import AbstractSet, Dict, Iterable, Optional, Tuple, Union
+
+_NS_PER_SECOND = 1_000_000_000
+
+# Set above the 128 address bits so IPv6 keys never collide with IPv4 keys
+_IPV6_KEY_TAG = 1 << 128
+
+# Largest header value served from the precomputed ASCII table; larger
+# remaining/reset values (long periods, huge bursts) are encoded on demand
+_ASCII_TABLE_MAX = 4096
+
+# Bucket table size that triggers the first sweep for idle buckets; later
+# sweeps wait until the table has doubled since the previous one
+_SWEEP_MIN_BUCKETS = 1024
+
+# Default cap on tracked (client, route) buckets
+_MAX_BUCKETS = 100_000
+
+_PERIODS = {
+    "second": 1.0,
+    "minute": 60.0,
+    "hour": 3600.0,
+    "day": 86400.0,
+}
+
+
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """Parse a "30/minute" style limit into (capacity, period in seconds)"""
+    count, _, period = rate.partition("/")
+    period = period.strip().lower().rstrip("s")
+    if period not in _PERIODS:
+        raise ValueError(f"Unsupported rate limit period: {rate!r}")
+    return int(count), _PERIODS[period]
+
+
+class TokenBucketLimiter:
+    """Token buckets keyed by (client, route)
+
+    Each route allows `capacity` requests per `period`; tokens refill
+    continuously at capacity/period per second, so a client that used its
+    burst regains one request every period/capacity seconds.
+
+    Bucket state is kept as a structure of arrays: each (client, route) key
+    maps to a slot in two flat int64 arrays, so a tracked client costs two
+    machine words instead of a list holding two boxed numbers.
+
+    All bucket math is integer. Time is read with time.monotonic_ns() and
+    tokens are stored in units of 1/period_ns token, so one nanosecond refills
+    exactly `capacity` units and no rounding ever accumulates.
+
+    A bucket left alone for a whole period is full again, exactly like a new
+    one, so it is forgotten by the next sweep; sweeps run when the table has
+    doubled since the last one, keeping their cost amortised. If a sweep still
+    leaves `max_buckets` buckets (many distinct clients within one period),
+    the least recently used half is dropped as well.
+    """
+
+    def __init__(self, limits: Dict[str, str], max_buckets: int = _MAX_BUCKETS):
+        self.limits: Dict[str, Tuple[int, float]] = {
+            path: parse_rate(rate) for path, rate in limits.items()
+        }
+        # path -> (capacity, units per token, units in a full bucket,
+        #          units refilled per second)
+        self._scaled: Dict[str, Tuple[int, int, int, int]] = {}
+        for path, (capacity, period) in self.limits.items():
+            period_ns = int(period * _NS_PER_SECOND)
+            self._scaled[path] = (
+                capacity, period_ns, capacity * period_ns, capacity * _NS_PER_SECOND,
+            )
+        # (client, path) -> slot in _tokens/_last
+        self._slots: Dict[Tuple[Union[int, str], str], int] = {}
+        self._tokens = array("q")  # token units left in each bucket
+        self._last = array("q")    # last refill time (time.monotonic_ns)
+        self.max_buckets = max_buckets
+        self._sweep_at = min(_SWEEP_MIN_BUCKETS, max_buckets)
+        # hit() is synchronous, but the limiter may be shared by event loops
+        # running in different threads (e.g. TestClient portals)
+        self._lock = threading.Lock()
+
+    def limit_for(self, path: str) -> Optional[Tuple[int, float]]:
+        """Return (capacity, period) for a route, or None if it is not limited"""
+        return self.limits.get(path)
+
+    def hit(self, client: Union[int, str], path: str) -> Tuple[bool, int, int, int]:
+        """Take one token for client on path
+
+        Returns (allowed, limit, remaining, reset) where reset is the number of
+        seconds until the bucket is full again (or, when refused, until the
+        next token is available).
+        """
+        capacity, token, full, per_second = self._scaled[path]
+        bucket_tokens = self._tokens
+        bucket_last = self._last
+        key = (client, path)
+
+        with self._lock:
+            now = time.monotonic_ns()
+
+            slot = self._slots.get(key)
+            if slot is None:
+                if len(bucket_tokens) >= self._sweep_at:
+                    self._sweep(now)
+                    bucket_tokens = self._tokens
+                    bucket_last = self._last
+                slot = self._slots[key] = len(bucket_tokens)
+                bucket_tokens.append(full)
+                bucket_last.append(now)
+                tokens = full
+            else:
+                tokens = bucket_tokens[slot] + (now - bucket_last[slot]) * capacity
+                if tokens > full:
+                    tokens = full
+                bucket_last[slot] = now
+
+            if tokens < token:
+                bucket_tokens[slot] = tokens
+                return False, capacity, 0, -((tokens - token) // per_second)
+
+            tokens -= token
+            bucket_tokens[slot] = tokens
+            return True, capacity, tokens // token, -((tokens - full) // per_second)
+
+    def _sweep(self, now: int):
+        """Drop idle buckets and compact the arrays (called with the lock held)"""
+        last = self._last
+        scaled = self._scaled
+        keep = [
+            (key, slot) for key, slot in self._slots.items()
+            if now - last[slot] < scaled[key[1]][1]
+        ]
+        if len(keep) >= self.max_buckets:
+            keep.sort(key=lambda item: last[item[1]], reverse=True)
+            del keep[self.max_buckets // 2:]
+
+        tokens = self._tokens
+        self._slots = {key: index for index, (key, _) in enumerate(keep)}
+        self._tokens = array("q", [tokens[slot] for _, slot in keep])
+        self._last = array("q", [last[slot] for _, slot in keep])
+        self._sweep_at = min(max(_SWEEP_MIN_BUCKETS, 2 * len(keep)), self.max_buckets)
+
+    def reset(self):
+        """Forget every bucket (all clients start with a full burst again)"""
+        with self._lock:
+            self._slots.clear()
+            del self._tokens[:]
+            del self._last[:]
+            self._sweep_at = min(_SWEEP_MIN_BUCKETS, self.max_buckets)
+
+
+def client_address(scope, trusted_proxies: AbstractSet[str] = frozenset()) -> str:
+    """Client IP: the socket peer, or the address forwarded by a trusted proxy
+
+    X-Forwarded-For is only read when the peer is one of `trusted_proxies`;
+    anyone else could send the header and get a fresh bucket per request.
+    Proxies append to the header, so hops are walked right to left and the
+    first address that is not itself a trusted proxy is the client.
+    """
+    client = scope.get("client")
+    address = client[0] if client else "unknown"
+    if address not in trusted_proxies:
+        return address
+
+    forwarded = [value for name, value in scope["headers"] if name == b"x-forwarded-for"]
+    if not forwarded:
+        return address
+    for hop in reversed(b",".join(forwarded).split(b",")):
+        address = hop.strip().decode("latin-1")
+        if address not in trusted_proxies:
+            break
+    return address
+
+
+def client_key(scope, trusted_proxies: AbstractSet[str] = frozenset()) -> Union[int, str]:
+    """Bucket key for the client: its IP as an int, or the raw address
+
+    Int keys hash in constant time, while a fresh address string is hashed
+    character by character on every request. Addresses that are not IPs
+    (test clients, unix sockets) are used as they are.
+    """
+    address = client_address(scope, trusted_proxies)
+    try:
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, address), "big")
+    except OSError:
+        pass
+    try:
+        return int.from_bytes(socket.inet_pton(socket.AF_INET6, address), "big") | _IPV6_KEY_TAG
+    except OSError:
+        return address
+
+
+class RateLimitMiddleware:
+    """ASGI middleware enforcing a TokenBucketLimiter on HTTP requests
+
+    Allowed responses get X-RateLimit-Limit/Remaining/Reset headers; refused
+    requests are answered with 429 and a Retry-After header without reaching
+    the application. Clients are identified by their socket address, or by
+    X-Forwarded-For when the request comes from one of `trusted_proxies`.
+    """
+
+    def __init__(self, app, limiter: TokenBucketLimiter, trusted_proxies: Iterable[str] = ()):
+        self.app = app
+        self.limiter = limiter
+        self.trusted_proxies = frozenset(trusted_proxies)
+        # Remaining and reset are bounded by the capacity and period of the
+        # route, so their header values come from a table of encoded ints
+        table_size = 1 + max(
+            [max(capacity, math.ceil(period)) for capacity, period in limiter.limits.values()],
+            default=0,
+        )
+        self._ascii = tuple(str(i).encode() for i in range(min(table_size, _ASCII_TABLE_MAX + 1)))
+        self._limit_headers = {
+            path: (b"x-ratelimit-limit", str(capacity).encode())
+            for path, (capacity, _) in limiter.limits.items()
+        }
+        # The 429 answer only varies in its reset time, so body and fixed
+        # headers are built once per route instead of on every refusal
+        self._refusals: Dict[str, Tuple[bytes, list]] = {}
+        for path, (capacity, period) in limiter.limits.items():
+            body = b'{"error":"Rate limit exceeded: %d per %d seconds"}' % (capacity, period)
+            self._refusals[path] = body, [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"x-ratelimit-limit", str(capacity).encode()),
+                (b"x-ratelimit-remaining", b"0"),
+            ]
+
+    def _encode(self, value: int) -> bytes:
+        """ASCII bytes of a non-negative header value"""
+        if value < len(self._ascii):
+            return self._ascii[value]
+        return str(value).encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if self.limiter.limit_for(path) is None:
+            await self.app(scope, receive, send)
+            return
+
+        allowed, limit, remaining, reset = self.limiter.hit(client_key(scope, self.trusted_proxies), path)
+
+        if not allowed:
+            body, headers = self._refusals[path]
+            reset_value = self._encode(reset)
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    *headers,
+                    (b"x-ratelimit-reset", reset_value),
+                    (b"retry-after", reset_value),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        rate_headers = [
+            self._limit_headers[path],
+            (b"x-ratelimit-remaining", self._encode(remaining)),
+            (b"x-ratelimit-reset", self._encode(reset)),
+        ]
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *rate_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -11,27 +11,31 @@ Purpose
 """
 
 import os
+import mmap
+import contextlib
 import time
+import weakref
 import asyncio
 import logging
 import datetime
-from typing import Union
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
 
 # Core dependencies
 import openai
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, Form, HTTPException,
-    Depends
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
+import orjson
 import uvicorn
 
 # Database models
 from memory_models import (
-    Memory, CoherenceSnapshot, MemoryTransaction, ApiKey,
+    Memory, CoherenceSnapshot, MemoryTransaction,
     MemorySources, MemoryContentTypes, MemoryStatus,
-    create_memory, get_memory, get_memories, update_memory, delete_memory,
-    create_coherence_snapshot, get_latest_coherence_snapshot,
-    log_transaction, get_transactions, initialize_database
+    create_memory_if_absent, content_digest, count_memories, update_memory,
+    get_latest_coherence_snapshot, log_transaction, initialize_database,
+    upsert_api_key
 )
 
 # Configure logging
@@ -54,23 +58,111 @@ app.add_middleware(
 )
 
 # Global variables
-active_connections: List[WebSocket] = []
+# Connected clients and their outbound frame queues; a client whose queue
+# is full misses frames instead of stalling everyone else. Keys are weak, so
+# a socket whose handler died without cleanup does not stay pinned here.
+SEND_QUEUE_SIZE = 256
+active_connections: "weakref.WeakKeyDictionary[WebSocket, asyncio.Queue[str]]" = weakref.WeakKeyDictionary()
 openai_api_key: Optional[str] = os.environ.get("OPENAI_API_KEY")
 coherence_ratio = "3:1"  # Default 75% coherence, 25% exploration
 
+# Largest ChatGPT export accepted by the import endpoints
+MAX_IMPORT_SIZE = 50 * 1024 * 1024  # 50 MB
+
+# Starlette keeps multipart files up to this size in memory before spooling
+# them to disk; only larger uploads are memory-mapped
+UPLOAD_SPOOL_MAX = 1024 * 1024  # 1 MB
+
+# Short-lived cache for values that are too expensive to recompute on every /status hit
+STATUS_CACHE_TTL = 5.0  # seconds
+SNAPSHOT_CACHE_TTL = 2.0  # seconds
+_status_cache: Dict[str, Any] = {}
+
 # Initialize OpenAI API key if available
 if openai_api_key:
     openai.api_key = openai_api_key
     logger.info("PYTHON_FLOW: OpenAI API key loaded from environment")
 
 
-# --- Pydantic Models ---
+# --- Upload size limit ---
+
+class UploadSizeLimitMiddleware:
+    """Reject oversized request bodies before the multipart parser spools them
+
+    A declared Content-Length above max_size is refused without reading the
+    body; otherwise the received bytes are counted and the stream is cut off
+    as soon as the tally passes max_size. Both cases answer 413.
+    """
+
+    def __init__(self, app, max_size: int, paths: tuple = ()):
+        self.app = app
+        self.max_size = max_size
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        declared = dict(scope["headers"]).get(b"content-length", b"")
+        if declared.isdigit() and int(declared) > self.max_size:
+            await self.reject(send)
+            return
+
+        received = 0
+        overflow = False
+
+        async def limited_receive():
+            nonlocal received, overflow
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_size:
+                    # Present the rest of the stream as a disconnect
+                    overflow = True
+                    return {"type": "http.disconnect"}
+            return message
 
-class StatusUpdate(BaseModel):
+        async def guarded_send(message):
+            if not overflow:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not overflow:
+                raise
+        if overflow:
+            await self.reject(send)
+
+    async def reject(self, send):
+        body = b'{"detail":"File too large. Max size is %d MB."}' % (self.max_size // (1024 * 1024))
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+app.add_middleware(UploadSizeLimitMiddleware, max_size=MAX_IMPORT_SIZE, paths=("/import/chatgpt",))
+
+
+# --- Models ---
+
+@dataclass(slots=True)
+class StatusUpdate:
+    """Internal status message; built by this module only, so it skips validation
+
+    orjson serializes it (including the datetime) directly to a JSON frame.
+    """
     status: str
     message: str
-    timestamp: datetime.datetime = Field(default_factory=datetime.datetime.now)
-    details: Dict[str, Any] = Field(default_factory=dict)
+    timestamp: datetime.datetime = field(default_factory=datetime.datetime.now)
+    details: Dict[str, Any] = field(default_factory=dict)
 
 class ChatMessage(BaseModel):
     role: str
@@ -92,57 +184,60 @@ class APIKeyRequest(BaseModel):
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    active_connections.append(websocket)
+    out_queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+    active_connections[websocket] = out_queue
+    sender = asyncio.create_task(sender_loop(websocket, out_queue))
     try:
         # Send welcome message
-        self.welcome_msg = {
+        welcome_msg = {
             "role": "system",
             "content": "Connected to WiltonOS Python Boot-Loader WebSocket",
             "timestamp": datetime.datetime.now().isoformat()
         }
-        await websocket.send_json(welcome_msg)
+        enqueue_frame(out_queue, orjson.dumps(welcome_msg).decode())
 
         # Send status update
-        self.status_update = StatusUpdate(
+        status_update = StatusUpdate(
             status="connected",
             message="WebSocket connection established",
             details={"coherence_ratio": coherence_ratio}
         )
-        await websocket.send_json(status_update.dict())
+        enqueue_frame(out_queue, orjson.dumps(status_update).decode())
 
         # Process incoming messages
         while True:
-            self.data = await websocket.receive_text()
+            data = await websocket.receive_text()
             try:
-                self.message = json.loads(data)
+                message = orjson.loads(data)
 
                 # Log received message
-                logger.info(f"WEBSOCKET_FLOW: Received message: {message.get('role',
-                    'unknown')} - {message.get('content', '')[:50]}...")
+                logger.info("WEBSOCKET_FLOW: Received message: %s - %.50s...",
+                            message.get("role", "unknown"), message.get("content", ""))
 
                 # Process message based on content
                 if message.get("role") == "user":
                     # Example of transaction logging
-                    self.transaction = MemoryTransaction(
+                    transaction = MemoryTransaction(
                         operation="message_received",
                         details={"message": message},
                         source="python-boot-loader"
                     )
-                    log_transaction(transaction)
+                    await asyncio.to_thread(log_transaction, transaction)
 
                     # Example echo response for now
-                    self.response = {
+                    response = {
                         "role": "assistant",
                         "content": f"Echo: {message.get('content', '')}",
                         "timestamp": datetime.datetime.now().isoformat()
                     }
-                    await websocket.send_json(response)
-            except json.JSONDecodeError:
-                logger.error("ERROR_FLOW: Invalid JSON message received: {data[:100]}...")
+                    enqueue_frame(out_queue, orjson.dumps(response).decode())
+            except orjson.JSONDecodeError:
+                logger.error("ERROR_FLOW: Invalid JSON message received: %s...", data[:100])
     except WebSocketDisconnect:
         logger.info("WEBSOCKET_FLOW: Client disconnected from WebSocket")
     finally:
-        active_connections.remove(websocket)
+        active_connections.pop(websocket, None)
+        sender.cancel()
 
 
 # --- Memory Import API ---
@@ -155,104 +250,158 @@ async def import_chatgpt(
 ):
     """Import a ChatGPT JSON export file"""
     try:
-        # Read file content
-        self.content = await file.read()
-
-        # Check file size
-        if len(content) > 50 * 1024 * 1024:  # 50 MB limit
+        # Check file size on the spooled upload before touching its content; the
+        # request body itself is already capped by UploadSizeLimitMiddleware
+        file.file.seek(0, os.SEEK_END)
+        file_size = file.file.tell()
+        if file_size > MAX_IMPORT_SIZE:
             raise HTTPException(status_code=413, detail="File too large. Max size is 50 MB.")
 
-        # Parse JSON content
-        try:
-            self.data = json.loads(content)
-
-            # Broadcast import status to all connected clients
-            self.status_update = StatusUpdate(
-                status="import_started",
-                message=f"Starting import of ChatGPT data: {title}",
-                details={"file_size": len(content), "dry_run": dry_run}
-            )
-            await broadcast_message(status_update.dict())
-
-            # Create memory record if not dry run
-            if not dry_run:
-                self.memory = Memory(
-                    title=title,
-                    content=json.dumps(data),
-                    content_type=MemoryContentTypes.JSON,
-                    source=MemorySources.CHATGPT,
-                    status=MemoryStatus.IMPORTING,
-                    imported_by="python",
-                    metadata={
-                        "file_name": file.filename,
-                        "file_size": len(content),
-                        "import_time": datetime.datetime.now().isoformat()
-                    }
-                )
-                self.memory = create_memory(memory)
-
-                # Log transaction
-                self.transaction = MemoryTransaction(
-                    memory_id=memory.id,
-                    operation="import",
-                    details={"title": title, "file_name": file.filename},
-                    source="python-boot-loader"
+        # Small uploads are still in memory and are read as they are; larger
+        # ones were spooled to disk and are mapped instead of read onto the
+        # heap. Both are released as soon as the import is done
+        if file_size > UPLOAD_SPOOL_MAX:
+            upload_buffer = map_upload(file)
+        else:
+            await file.seek(0)
+            upload_buffer = contextlib.nullcontext(await file.read())
+
+        with upload_buffer as buffer, memoryview(buffer) as content:
+            # Parse JSON content
+            try:
+                data = orjson.loads(content)
+                conversations = get_conversations(data)
+
+                # Broadcast import status to all connected clients
+                status_update = StatusUpdate(
+                    status="import_started",
+                    message=f"Starting import of ChatGPT data: {title}",
+                    details={"file_size": file_size, "dry_run": dry_run}
                 )
-                log_transaction(transaction)
+                await broadcast_frame(orjson.dumps(status_update).decode())
+
+                # Create memory record if not dry run; the upload is stored as
+                # received, parsing only validates it and yields the conversations
+                if not dry_run:
+                    memory = Memory(
+                        title=title,
+                        content=str(content, "utf-8"),
+                        content_hash=content_digest(content),
+                        content_type=MemoryContentTypes.JSON,
+                        source=MemorySources.CHATGPT,
+                        status=MemoryStatus.IMPORTING,
+                        imported_by="python",
+                        meta_data={
+                            "file_name": file.filename,
+                            "file_size": file_size,
+                            "conversation_count": len(conversations),
+                            "import_time": datetime.datetime.now().isoformat()
+                        }
+                    )
+                    # The conversations are stored as individual rows in the same
+                    # transaction as the memory
+                    memory, created = await asyncio.to_thread(create_memory_if_absent, memory, conversations)
+                    if not created:
+                        # Same export was already imported; nothing else to write
+                        return {
+                            "success": True,
+                            "message": "ChatGPT data already imported",
+                            "memory_id": memory.id,
+                            "duplicate": True
+                        }
 
-                # Update memory status to processed
-                self.memory = update_memory(memory.id, status=MemoryStatus.PROCESSED)
+                    # Log transaction
+                    transaction = MemoryTransaction(
+                        memory_id=memory.id,
+                        operation="import",
+                        details={"title": title, "file_name": file.filename},
+                        source="python-boot-loader"
+                    )
+                    await asyncio.to_thread(log_transaction, transaction)
 
-                # Broadcast completion status
-                self.status_update = StatusUpdate(
-                    status="import_completed",
-                    message=f"Import completed: {title}",
-                    details={"memory_id": memory.id}
-                )
-                await broadcast_message(status_update.dict())
-
-                return {
-                    "success": True,
-                    "message": "ChatGPT data imported successfully",
-                    "memory_id": memory.id
-                }
-            else:
-                # Dry run - just validate and return stats
-                self.conversation_count = len(data.get("conversations", []))
-
-                return {
-                    "success": True,
-                    "message": "Dry run successful",
-                    "stats": {
-                        "file_size": len(content),
-                        "conversation_count": conversation_count,
-                        "would_import": True
+                    # Update memory status to processed
+                    memory = await asyncio.to_thread(update_memory, memory.id, status=MemoryStatus.PROCESSED)
+
+                    # Broadcast completion status
+                    status_update = StatusUpdate(
+                        status="import_completed",
+                        message=f"Import completed: {title}",
+                        details={"memory_id": memory.id}
+                    )
+                    await broadcast_frame(orjson.dumps(status_update).decode())
+
+                    return {
+                        "success": True,
+                        "message": "ChatGPT data imported successfully",
+                        "memory_id": memory.id
+                    }
+                else:
+                    # Dry run - just validate and return stats
+                    return {
+                        "success": True,
+                        "message": "Dry run successful",
+                        "stats": {
+                            "file_size": file_size,
+                            "conversation_count": len(conversations),
+                            "would_import": True
+                        }
                     }
-                }
 
-        except json.JSONDecodeError:
-            raise HTTPException(status_code=400, detail="Invalid JSON file")
+            except orjson.JSONDecodeError:
+                raise HTTPException(status_code=400, detail="Invalid JSON file")
 
     except (TypeError, ValueError, AttributeError) as error:
-        logger.error("ERROR_FLOW: Error importing ChatGPT data: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error importing ChatGPT data: {str(e)}")
+        logger.error("ERROR_FLOW: Error importing ChatGPT data: %s", error)
+        raise HTTPException(status_code=500, detail=f"Error importing ChatGPT data: {error}")
 
 
 # --- File Chunk Streaming Support ---
 
+# Clients that opt in with "batch_acks" get chunk acknowledgements in
+# batches rather than one by one
+CHUNK_ACK_INTERVAL = 32
+CHUNK_ACK_BYTES = 256 * 1024
+
+# Most memory reserved up front for an announced upload size; larger uploads
+# grow the buffer as their bytes actually arrive
+UPLOAD_PREALLOCATE_MAX = 4 * 1024 * 1024  # 4 MB
+
+# Pre-rendered chunk acknowledgement; only the chunk number varies
+CHUNK_ACK_TEMPLATE = '{"status":"chunk_received","message":"Received chunk %d","chunk_number":%d}'
+
 @app.websocket("/ws/file-upload")
 async def file_upload_websocket(websocket: WebSocket):
-    """WebSocket endpoint for chunked file uploads"""
+    """WebSocket endpoint for chunked file uploads
+
+    Protocol:
+    1. The client sends a JSON metadata frame (content_type, total_chunks and
+       optionally total_size, title, file_name, source, dry_run, batch_acks).
+    2. The server answers {"status": "ready"}.
+    3. The client sends the file as binary chunks. By default every chunk is
+       answered with a {"status": "chunk_received"} frame, so a client may
+       wait for it before sending the next chunk. With "batch_acks": true the
+       server only acknowledges every CHUNK_ACK_INTERVAL chunks, every
+       CHUNK_ACK_BYTES bytes and the last chunk; such clients must keep
+       sending without waiting for each acknowledgement.
+    4. After the last chunk the server sends a final success or error frame.
+    """
     await websocket.accept()
 
-    self.file_chunks = []
-    self.file_metadata = None
-
     try:
         # First message should be metadata
-        self.data = await websocket.receive_text()
-        self.metadata = json.loads(data)
-        self.file_metadata = metadata
+        data = await websocket.receive_text()
+        metadata = orjson.loads(data)
+
+        # Chunks are copied in place into one buffer, preallocated when the
+        # client announces total_size, so the file is never held twice. The
+        # size comes from an unauthenticated client, so at most
+        # UPLOAD_PREALLOCATE_MAX is reserved before any data arrives
+        total_size = metadata.get("total_size")
+        if isinstance(total_size, int) and 0 < total_size <= MAX_IMPORT_SIZE:
+            buffer = bytearray(min(total_size, UPLOAD_PREALLOCATE_MAX))
+        else:
+            buffer = bytearray()
+        received = 0
 
         # Send acknowledgment
         await websocket.send_json({
@@ -260,56 +409,78 @@ async def file_upload_websocket(websocket: WebSocket):
             "message": "Ready to receive file chunks"
         })
 
-        # Receive chunks
-        self.chunk_count = 0
+        # Receive chunks, acknowledging each one, or with batch_acks every
+        # CHUNK_ACK_INTERVAL chunks, every CHUNK_ACK_BYTES bytes and always
+        # the last chunk
+        batch_acks = metadata.get("batch_acks") is True
+        total_chunks = metadata.get("total_chunks")
+        chunk_count = 0
+        acked_size = 0
         while True:
-            self.chunk = await websocket.receive_bytes()
-            file_chunks.append(chunk)
-            chunk_count += 1
+            chunk = await websocket.receive_bytes()
 
-            # Acknowledge chunk
-            await websocket.send_json({
-                "status": "chunk_received",
-                "message": f"Received chunk {chunk_count}",
-                "chunk_number": chunk_count
-            })
+            # total_size is optional and only advisory, so the cap is
+            # enforced on the bytes actually received
+            if received + len(chunk) > MAX_IMPORT_SIZE:
+                await websocket.send_json({
+                    "status": "error",
+                    "message": "File too large. Max size is 50 MB."
+                })
+                await websocket.close(code=1009)
+                return
+
+            buffer[received:received + len(chunk)] = chunk
+            received += len(chunk)
+            chunk_count += 1
 
             # Check if this was the last chunk
-            if chunk_count == metadata.get("total_chunks"):
-                break
+            last_chunk = chunk_count == total_chunks
+
+            # Acknowledge received chunks
+            if (not batch_acks or last_chunk or chunk_count % CHUNK_ACK_INTERVAL == 0
+                    or received - acked_size >= CHUNK_ACK_BYTES):
+                await websocket.send_text(CHUNK_ACK_TEMPLATE % (chunk_count, chunk_count))
+                acked_size = received
 
-        # Combine chunks
-        self.complete_file = b''.join(file_chunks)
+            if last_chunk:
+                break
 
         # Process the file
         if metadata.get("content_type") == "application/json":
             try:
                 # Parse JSON content
-                self.data = json.loads(complete_file)
+                content = memoryview(buffer)[:received]
+                data = orjson.loads(content)
+                conversations = get_conversations(data)
 
-                # Create memory if not dry run
+                # Create memory if not dry run, storing the upload as received
                 if not metadata.get("dry_run", False):
-                    self.memory = Memory(
+                    memory = Memory(
                         title=metadata.get("title", "Uploaded via WebSocket"),
-                        content=json.dumps(data),
+                        content=str(content, "utf-8"),
+                        content_hash=content_digest(content),
                         content_type=MemoryContentTypes.JSON,
                         source=metadata.get("source", MemorySources.CHATGPT),
                         status=MemoryStatus.PROCESSED,
                         imported_by="python-websocket",
-                        metadata={
+                        meta_data={
                             "file_name": metadata.get("file_name", "unknown"),
-                            "file_size": len(complete_file),
+                            "file_size": received,
                             "chunk_count": chunk_count,
+                            "conversation_count": len(conversations),
                             "import_time": datetime.datetime.now().isoformat()
                         }
                     )
-                    self.memory = create_memory(memory)
+                    # The conversations are stored in the same transaction as
+                    # the memory (both skipped on a re-import)
+                    memory, created = await asyncio.to_thread(create_memory_if_absent, memory, conversations)
 
                     # Send success response
                     await websocket.send_json({
                         "status": "success",
-                        "message": "File processed successfully",
-                        "memory_id": memory.id
+                        "message": "File processed successfully" if created else "File already imported",
+                        "memory_id": memory.id,
+                        "duplicate": not created
                     })
                 else:
                     # Dry run response
@@ -317,12 +488,12 @@ async def file_upload_websocket(websocket: WebSocket):
                         "status": "success",
                         "message": "Dry run successful",
                         "stats": {
-                            "file_size": len(complete_file),
-                            "conversation_count": len(data.get("conversations", [])),
+                            "file_size": received,
+                            "conversation_count": len(conversations),
                             "would_import": True
                         }
                     })
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 await websocket.send_json({
                     "status": "error",
                     "message": "Invalid JSON file"
@@ -336,11 +507,11 @@ async def file_upload_websocket(websocket: WebSocket):
     except WebSocketDisconnect:
         logger.info("WEBSOCKET_FLOW: Client disconnected during file upload")
     except (TypeError, ValueError, AttributeError) as error:
-        logger.error("ERROR_FLOW: Error processing file upload: {str(e)}")
+        logger.error("ERROR_FLOW: Error processing file upload: %s", error)
         try:
             await websocket.send_json({
                 "status": "error",
-                "message": f"Error processing file: {str(e)}"
+                "message": f"Error processing file: {error}"
             })
         except:
             pass
@@ -354,32 +525,21 @@ async def set_api_key(request: APIKeyRequest):
     global openai_api_key
 
     try:
-        # Store key identifier in database for tracking
-        self.key_prefix = request.api_key[:4] + "..." if request.api_key else "null"
-
-        self.api_key_entry = ApiKey(
-            name="openai_api_key",
-            service="openai",
-            key_identifier=key_prefix,
-            active=True
-        )
-
-        # Add to database
-        with get_session() as session:
-            session.add(api_key_entry)
-            session.commit()
+        # Store key identifier in database for tracking (one row per key name)
+        key_prefix = request.api_key[:4] + "..." if request.api_key else "null"
+        await asyncio.to_thread(upsert_api_key, "openai_api_key", "openai", key_prefix)
 
         # Set the key for OpenAI library
-        self.openai_api_key = request.api_key
+        openai_api_key = request.api_key
         openai.api_key = request.api_key
 
         # Log status but don't expose the key
-        logger.info("CONFIG_FLOW: API key set successfully: {key_prefix}")
+        logger.info("CONFIG_FLOW: API key set successfully: %s", key_prefix)
 
         return {"success": True, "message": "API key set successfully"}
     except (TypeError, ValueError, AttributeError) as error:
-        logger.error("ERROR_FLOW: Error setting API key: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error setting API key: {str(e)}")
+        logger.error("ERROR_FLOW: Error setting API key: %s", error)
+        raise HTTPException(status_code=500, detail=f"Error setting API key: {error}")
 
 
 # --- Status API ---
@@ -388,14 +548,15 @@ async def set_api_key(request: APIKeyRequest):
 async def get_status():
     """Get the status of the Python boot-loader"""
     try:
-        # Get latest coherence snapshot
-        self.latest_snapshot = get_latest_coherence_snapshot()
+        # Get latest coherence snapshot (cached for SNAPSHOT_CACHE_TTL seconds)
+        latest_snapshot = await cached_status_value("latest_snapshot", get_latest_coherence_snapshot,
+                                                    ttl=SNAPSHOT_CACHE_TTL)
 
-        # Count memories
-        self.memory_count = len(get_memories(limit=1000))
+        # Count memories (cached for STATUS_CACHE_TTL seconds)
+        memory_count = await cached_status_value("memory_count", count_memories)
 
         # Basic health check
-        self.health_check = {
+        health_check = {
             "database_connected": True,
             "api_key_configured": bool(openai_api_key),
             "active_websocket_connections": len(active_connections),
@@ -412,24 +573,103 @@ async def get_status():
             "timestamp": datetime.datetime.now().isoformat()
         }
     except (TypeError, ValueError, AttributeError) as error:
-        logger.error("ERROR_FLOW: Error getting status: {str(e)}")
+        logger.error("ERROR_FLOW: Error getting status: %s", error)
         return {
             "success": False,
             "status": "error",
-            "error": str(e),
+            "error": str(error),
             "timestamp": datetime.datetime.now().isoformat()
         }
 
 
 # --- Helper Functions ---
 
+def map_upload(upload: UploadFile) -> mmap.mmap:
+    """Map an uploaded file into memory instead of reading it
+
+    Starlette spools large request files to a temporary file, so mapping its
+    descriptor lets the JSON parser read straight from the page cache. Only
+    call this for uploads above UPLOAD_SPOOL_MAX: fileno() forces a spool
+    that is still in memory to roll over to disk. The caller closes the map,
+    e.g. by using it as a context manager.
+    """
+    upload.file.seek(0)
+    return mmap.mmap(upload.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+async def cached_status_value(key: str, loader, ttl: float = STATUS_CACHE_TTL):
+    """Return the cached value for key, calling loader() once it is older than ttl seconds
+
+    The loader hits the database, so it runs in a worker thread. The cache
+    holds the loading task itself, so concurrent misses await one load
+    instead of each querying the database; a failed load is not cached.
+    """
+    now = time.monotonic()
+    entry = _status_cache.get(key)
+    if entry is None or entry[0] <= now:
+        task = asyncio.ensure_future(asyncio.to_thread(loader))
+        entry = _status_cache[key] = (now + ttl, task)
+        task.add_done_callback(lambda done: _drop_failed_status_value(key, done))
+    # Shielded so a cancelled caller does not cancel the load shared with others
+    return await asyncio.shield(entry[1])
+
+
+def _drop_failed_status_value(key: str, task: "asyncio.Future[Any]"):
+    """Forget a load that raised, so the next call retries it"""
+    if (task.cancelled() or task.exception() is not None) and _status_cache.get(key, (None, None))[1] is task:
+        del _status_cache[key]
+
+
+def invalidate_status_value(key: str):
+    """Drop a cached status value after the underlying data changed"""
+    _status_cache.pop(key, None)
+
+def get_conversations(data: Union[Dict[str, Any], List[Any]]) -> List[Dict[str, Any]]:
+    """Return the conversation list of a ChatGPT export
+
+    Accepts both the raw conversations.json export (a top-level list) and a
+    wrapper object with a "conversations" key.
+    """
+    if isinstance(data, list):
+        return data
+    return data.get("conversations", [])
+
+async def sender_loop(websocket: WebSocket, out_queue: "asyncio.Queue[str]"):
+    """Drain a client's outbound queue onto its WebSocket"""
+    try:
+        while True:
+            frame = await out_queue.get()
+            await websocket.send_text(frame)
+    except asyncio.CancelledError:
+        raise
+    except Exception as error:
+        logger.info("WEBSOCKET_FLOW: Stopped sending to client: %s", error)
+
+
+def enqueue_frame(out_queue: "asyncio.Queue[str]", frame: str):
+    """Queue a text frame for a client, dropping it if the client is too far behind"""
+    try:
+        out_queue.put_nowait(frame)
+    except asyncio.QueueFull:
+        logger.warning("WEBSOCKET_FLOW: Outbound queue full, dropping frame")
+
+
+async def broadcast_frame(frame: str):
+    """Queue an already-encoded JSON text frame for every connected WebSocket client"""
+    for out_queue in list(active_connections.values()):
+        enqueue_frame(out_queue, frame)
+
+
 async def broadcast_message(message: Dict[str, Any]):
-    """Broadcast a message to all connected WebSocket clients"""
-    for connection in active_connections:
-        try:
-            await connection.send_json(message)
-        except (TypeError, ValueError, AttributeError) as error:
-            logger.error("ERROR_FLOW: Error broadcasting message: {str(e)}")
+    """Broadcast a message to all connected WebSocket clients
+
+    The message is serialized once and the same text frame is queued for
+    every connection; each client's sender task delivers it.
+    """
+    if not active_connections:
+        return
+
+    await broadcast_frame(orjson.dumps(message).decode())
 
 
 # --- Database Initialization ---
@@ -438,31 +678,42 @@ async def broadcast_message(message: Dict[str, Any]):
 async def startup_event():
     """Initialize the database on startup"""
     global start_time
-    self.start_time = time.time()
+    start_time = time.time()
 
     logger.info("PYTHON_FLOW: Starting WiltonOS Boot-Loader")
 
-    # Initialize database
+    # Initialize database and create the initial coherence snapshot in one transaction
     try:
-        initialize_database()
-        logger.info("DATABASE_FLOW: Database initialized successfully")
-
-        # Create initial coherence snapshot
-        self.snapshot = CoherenceSnapshot(
+        snapshot = CoherenceSnapshot(
             coherence_ratio="3:1",  # 75% coherence, 25% exploration
             coherence_score=75,
             stability_score=75,
             exploration_score=25,
             source="initialization"
         )
-        create_coherence_snapshot(snapshot)
-        logger.info("DATABASE_FLOW: Initial coherence snapshot created")
+        initialize_database(seed_rows=[snapshot])
+        invalidate_status_value("latest_snapshot")
+        logger.info("DATABASE_FLOW: Database initialized with initial coherence snapshot")
 
     except (TypeError, ValueError, AttributeError) as error:
-        logger.error("ERROR_FLOW: Database initialization error: {str(e)}")
+        logger.error("ERROR_FLOW: Database initialization error: %s", error)
 
 
 # --- Main Entry Point ---
 
 if __name__ == "__main__":
-    uvicorn.run("wiltonos_boot_db:app", host="0.0.0.0", port=8000, reload=True)
+    # "auto" serves on uvloop, httptools and websockets when they are
+    # installed, falling back to asyncio, h11 and wsproto. Auto-reload is for
+    # development only (WILTONOS_RELOAD=1). Broadcast frames are encoded once and shared by
+    # every client; with permessage-deflate each connection would compress
+    # the same frame again.
+    uvicorn.run(
+        "wiltonos_boot_db:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="auto",
+        ws="auto",
+        reload=os.environ.get("WILTONOS_RELOAD", "0") == "1",
+        ws_per_message_deflate=False,
+    )
@@ -6,19 +6,50 @@ e a biblioteca Pillow. Diferentes padrões são implementados como funções
 independentes.
 """
 
-import os
 import math
-import random
-import json
 import base64
 import io
-from datetime import datetime
+import functools
+import inspect
+import numpy as np
 from PIL import Image, ImageDraw, ImageFilter
 
 # Constantes
 PI = math.pi
 GOLDEN_RATIO = (1 + math.sqrt(5)) / 2
 
+# Nível de compressão zlib dos PNGs gerados
+PNG_COMPRESS_LEVEL = 1
+
+# Formatos aceitos pelo parâmetro return_format dos geradores
+RETURN_FORMATS = ("dataurl", "base64", "bytes")
+
+# Quantidade de renderizações determinísticas guardadas por gerador. O cache
+# vive no processo: só ajuda quem importa este módulo e chama os geradores
+# várias vezes (não as rotas em sacred-geometry-routes.ts, que iniciam um
+# python3 novo a cada requisição)
+RENDER_CACHE_SIZE = 64
+
+# Vetores unitários das seis direções de uma grade hexagonal
+HEX_DIRS = tuple((math.cos(k * PI / 3), math.sin(k * PI / 3)) for k in range(6))
+
+# Arestas do Cubo de Metatron: todos os pares (i, j), i < j, dos 13 pontos
+_METATRON_EDGES = np.array([(i, j) for i in range(13) for j in range(i + 1, 13)])
+
+# Ordem (r, g, b) por setor de 60° da matiz, indexando a tupla (v, p, q, t)
+HSV_SECTOR_ORDER = (
+    (0, 3, 1),
+    (2, 0, 1),
+    (1, 0, 3),
+    (1, 2, 0),
+    (3, 1, 0),
+    (0, 1, 2),
+)
+_HSV_SECTOR_ORDER = np.array(HSV_SECTOR_ORDER)
+
+# Gerador usado pelo ruído quântico
+_rng = np.random.default_rng()
+
 def golden_ratio():
     """Retorna o número de ouro"""
     return GOLDEN_RATIO
@@ -35,37 +66,151 @@ def hsv_to_rgb(h, s, v):
     p = v * (1 - s)
     q = v * (1 - f * s)
     t = v * (1 - (1 - f) * s)
-    
-    if hi == 0: r, g, b = v, t, p
-    elif hi == 1: r, g, b = q, v, p
-    elif hi == 2: r, g, b = p, v, t
-    elif hi == 3: r, g, b = p, q, v
-    elif hi == 4: r, g, b = t, p, v
-    elif hi == 5: r, g, b = v, p, q
-    
-    return int(r * 255), int(g * 255), int(b * 255)
+
+    # Escolher os canais pela tabela do setor, sem a escada de ifs
+    channels = (v, p, q, t)
+    r, g, b = HSV_SECTOR_ORDER[hi]
+    return int(channels[r] * 255), int(channels[g] * 255), int(channels[b] * 255)
+
+def hsv_to_rgb_batch(h, s, v):
+    """Converte vetores HSV para RGB de uma vez
+
+    Aceita arrays (ou escalares, por broadcast) e devolve um array (N, 3)
+    de inteiros com os mesmos valores que hsv_to_rgb daria para cada elemento
+    (inclusive fora de [0, 255] quando a saturação passa de 1).
+    """
+    h, s, v = np.broadcast_arrays(
+        np.asarray(h, dtype=np.float64),
+        np.asarray(s, dtype=np.float64),
+        np.asarray(v, dtype=np.float64),
+    )
+    h60 = h / 60.0
+    h60f = np.floor(h60)
+    hi = h60f.astype(np.int64) % 6
+    f = h60 - h60f
+    p = v * (1 - s)
+    q = v * (1 - f * s)
+    t = v * (1 - (1 - f) * s)
+
+    channels = np.stack((v, p, q, t), axis=-1)
+    rgb = np.take_along_axis(channels, _HSV_SECTOR_ORDER[hi], axis=-1)
+    return (rgb * 255).astype(np.int64)
+
+def rgb_tuples(colors, alpha=None):
+    """Converte um array (N, 3) em lista de tuplas aceitas pelo ImageDraw"""
+    if alpha is None:
+        return [tuple(c) for c in colors.tolist()]
+    return [tuple(c) + (alpha,) for c in colors.tolist()]
 
 def apply_quantum_noise(image, intensity=0.05):
-    """Aplica ruído quântico à imagem para criar texturas"""
-    pixels = image.load()
-    width, height = image.size
-    
-    for y in range(height):
-        for x in range(width):
-            r, g, b, a = pixels[x, y]
-            
-            # Aplicar ruído aleatório com base na "incerteza quântica"
-            if random.random() < intensity:
-                noise = random.uniform(-20, 20)
-                r = max(0, min(255, r + noise))
-                g = max(0, min(255, g + noise))
-                b = max(0, min(255, b + noise))
-                
-            pixels[x, y] = (int(r), int(g), int(b), a)
-    
-    return image
+    """Aplica ruído quântico à imagem para criar texturas
+
+    Cada pixel recebe, com probabilidade `intensity`, o mesmo deslocamento
+    aleatório em [-20, 20) nos canais de cor; o canal alfa não é alterado.
+    """
+    pixels = np.array(image, dtype=np.int16)
+    height, width = pixels.shape[:2]
+
+    # Sortear os pixels afetados pela "incerteza quântica"
+    mask = _rng.random((height, width)) < intensity
+    noise = _rng.uniform(-20, 20, int(mask.sum())).astype(np.int16)
+
+    pixels[mask, :3] += noise[:, None]
+    np.clip(pixels, 0, 255, out=pixels)
+
+    return Image.fromarray(pixels.astype(np.uint8))
+
+def encode_image(image, message, return_format="dataurl"):
+    """
+    Codifica a imagem como PNG e monta a resposta do gerador
+
+    As imagens são payloads transitórios (URLs de dados), então o zlib roda
+    no nível 1: a compressão fica um pouco pior, mas a codificação é várias
+    vezes mais rápida que no nível padrão (6).
+
+    return_format escolhe o que vai na resposta:
+        "dataurl": 'image_url' (URL de dados) e 'image_base64'
+        "base64":  apenas 'image_base64'
+        "bytes":   'image_bytes' com o PNG cru, sem passar por base64
+    """
+    if return_format not in RETURN_FORMATS:
+        raise ValueError(f"Formato de retorno inválido: {return_format}")
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+
+    result = {
+        'success': True,
+        'message': message,
+        'image_type': 'image/png'
+    }
+
+    if return_format == "bytes":
+        result['image_bytes'] = buffer.getvalue()
+        return result
 
-def flower_of_life(size=1000, background_color=(0, 0, 0, 255), circles=7, color_mode="rainbow"):
+    # Codificar direto da memória do buffer, sem a cópia de getvalue()
+    with buffer.getbuffer() as raw:
+        img_str = base64.b64encode(raw).decode('ascii')
+    result['image_base64'] = img_str
+
+    if return_format == "dataurl":
+        # Criar URL de dados
+        result['image_url'] = f"data:image/png;base64,{img_str}"
+
+    return result
+
+def new_canvas(size, background_color):
+    """
+    Cria a tela do gerador
+
+    Com fundo opaco a imagem é RGB: nenhum desenho desses geradores usa
+    transparência, e o canal alfa só aumentaria em 1/3 os bytes que passam
+    pelo ruído, pelo desfoque e pela codificação PNG.
+    """
+    if len(background_color) == 3 or background_color[3] == 255:
+        return Image.new('RGB', (size, size), tuple(background_color[:3]))
+    return Image.new('RGBA', (size, size), background_color)
+
+def _hashable(value):
+    """Converte listas (como as cores vindas de JSON) em tuplas, recursivamente"""
+    if isinstance(value, list):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+def memoized_render(generator):
+    """
+    Guarda em cache (LRU) o resultado de um gerador por combinação de argumentos
+
+    O modo "quantum" aplica ruído aleatório e por isso nunca é guardado. Cada
+    chamada recebe uma cópia rasa do dicionário, de modo que alterações feitas
+    pelo chamador não contaminam o cache (as strings base64 são imutáveis).
+    Argumentos em lista são convertidos em tuplas antes de chegar ao cache.
+
+    O cache pertence ao processo atual, então só há acertos para chamadores
+    que mantêm o módulo carregado entre chamadas (por exemplo
+    generate_all_patterns chamado repetidamente); um processo por requisição
+    sempre renderiza do zero.
+    """
+    signature = inspect.signature(generator)
+    cached = functools.lru_cache(maxsize=RENDER_CACHE_SIZE)(generator)
+
+    @functools.wraps(generator)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = {name: _hashable(value) for name, value in bound.arguments.items()}
+        if arguments.get("color_mode") == "quantum":
+            return generator(**arguments)
+        return dict(cached(**arguments))
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+@memoized_render
+def flower_of_life(size=1000, background_color=(0, 0, 0, 255), circles=7, color_mode="rainbow",
+        return_format="dataurl"):
     """
     Gera uma imagem com o padrão Flor da Vida
     
@@ -74,11 +219,12 @@ def flower_of_life(size=1000, background_color=(0, 0, 0, 255), circles=7, color_
         background_color: Cor de fundo (RGBA)
         circles: Número de círculos
         color_mode: "rainbow", "golden", "monochrome" ou "quantum"
+        return_format: "dataurl", "base64" ou "bytes" (ver encode_image)
         
     Returns:
-        Caminho da imagem gerada
+        Dicionário com a imagem gerada
     """
-    # Criar imagem com fundo transparente
+    # Criar imagem RGBA: os preenchimentos semitransparentes gravam alfa
     image = Image.new('RGBA', (size, size), background_color)
     draw = ImageDraw.Draw(image)
     
@@ -92,54 +238,49 @@ def flower_of_life(size=1000, background_color=(0, 0, 0, 255), circles=7, color_
     # Desenhar círculo central
     drawn_circles.append((center_x, center_y))
     
-    # Desenhar os círculos hexagonalmente
+    # Desenhar os círculos hexagonalmente: cada camada é um anel que parte
+    # do canto na direção i e anda `layer` passos na direção i + 2, de modo
+    # que cada posição da grade é visitada uma única vez
+    step = radius * 2
     for layer in range(1, circles + 1):
-        # Para cada camada, desenhar círculos em um padrão hexagonal
         for i in range(6):
-            angle = PI / 3 * i
+            corner_x, corner_y = HEX_DIRS[i]
+            walk_x, walk_y = HEX_DIRS[(i + 2) % 6]
             for j in range(layer):
-                x = center_x + layer * radius * 2 * math.cos(angle)
-                y = center_y + layer * radius * 2 * math.sin(angle)
-                
-                # Verificar se o círculo já foi desenhado
-                if (x, y) not in drawn_circles:
-                    drawn_circles.append((x, y))
-                
-                # Ângulo para a próxima posição
-                angle += PI / 3
+                x = center_x + step * (layer * corner_x + j * walk_x)
+                y = center_y + step * (layer * corner_y + j * walk_y)
+                drawn_circles.append((x, y))
     
+    # Resolver todas as cores de uma vez, antes do laço de desenho
+    count = len(drawn_circles)
+    steps = np.arange(count) / count
+    if color_mode == "rainbow":
+        # Esquema de cores arco-íris
+        hues = steps * 360
+        stroke_colors = rgb_tuples(hsv_to_rgb_batch(hues, 0.8, 1.0))
+        fill_colors = rgb_tuples(hsv_to_rgb_batch(hues, 0.3, 1.0), alpha=50)
+    elif color_mode == "golden":
+        # Esquema de cores dourado
+        hues = steps * 60 + 30
+        stroke_colors = rgb_tuples(hsv_to_rgb_batch(hues, 0.8, 1.0))
+        fill_colors = rgb_tuples(hsv_to_rgb_batch(hues, 0.3, 0.9), alpha=30)
+    elif color_mode == "monochrome":
+        # Esquema monocromático, com preenchimento transparente
+        values = (255 * (1 - steps * 0.7)).astype(np.uint8)
+        stroke_colors = rgb_tuples(np.repeat(values[:, None], 3, axis=1))
+        fill_colors = [(0, 0, 0, 0)] * count
+    elif color_mode == "quantum":
+        # Esquema quântico (azul profundo a púrpura)
+        hues = 240 + steps * 60
+        stroke_colors = rgb_tuples(hsv_to_rgb_batch(hues, 0.9, 0.9))
+        fill_colors = rgb_tuples(hsv_to_rgb_batch(hues, 0.3, 0.7), alpha=20)
+    else:
+        # Padrão
+        stroke_colors = [(255, 255, 255)] * count
+        fill_colors = [(0, 0, 0, 0)] * count
+
     # Desenhar todos os círculos
-    for i, (x, y) in enumerate(drawn_circles):
-        # Determinar a cor com base no modo escolhido
-        if color_mode == "rainbow":
-            # Esquema de cores arco-íris
-            hue = (i / len(drawn_circles)) * 360
-            stroke_color = hsv_to_rgb(hue, 0.8, 1.0)
-            fill_color = hsv_to_rgb(hue, 0.3, 1.0)
-            fill_color = fill_color + (50,)  # Adicionar alfa
-        elif color_mode == "golden":
-            # Esquema de cores dourado
-            golden_value = (i / len(drawn_circles)) * 60 + 30
-            stroke_color = hsv_to_rgb(golden_value, 0.8, 1.0)
-            fill_color = hsv_to_rgb(golden_value, 0.3, 0.9)
-            fill_color = fill_color + (30,)
-        elif color_mode == "monochrome":
-            # Esquema monocromático
-            value = int(255 * (1 - (i / len(drawn_circles)) * 0.7))
-            stroke_color = (value, value, value)
-            fill_color = (0, 0, 0, 0)  # Transparente
-        elif color_mode == "quantum":
-            # Esquema quântico (azul profundo a púrpura)
-            hue = 240 + (i / len(drawn_circles)) * 60
-            stroke_color = hsv_to_rgb(hue, 0.9, 0.9)
-            fill_color = hsv_to_rgb(hue, 0.3, 0.7)
-            fill_color = fill_color + (20,)
-        else:
-            # Padrão
-            stroke_color = (255, 255, 255)
-            fill_color = (0, 0, 0, 0)
-        
-        # Desenhar círculo
+    for (x, y), stroke_color, fill_color in zip(drawn_circles, stroke_colors, fill_colors):
         draw.ellipse(
             [(x - radius, y - radius), (x + radius, y + radius)],
             outline=stroke_color,
@@ -151,26 +292,16 @@ def flower_of_life(size=1000, background_color=(0, 0, 0, 255), circles=7, color_
     if color_mode == "quantum":
         image = apply_quantum_noise(image)
     
-    # Aplicar um leve desfoque para suavizar as bordas
-    image = image.filter(ImageFilter.GaussianBlur(radius=0.5))
-    
-    # Converter a imagem para base64
-    buffer = io.BytesIO()
-    image.save(buffer, format="PNG")
-    img_str = base64.b64encode(buffer.getvalue()).decode('utf-8')
+    # Aplicar um leve desfoque (box blur de uma passada) para suavizar as bordas
+    image = image.filter(ImageFilter.BoxBlur(radius=0.5))
     
-    # Criar URL de dados
-    data_url = f"data:image/png;base64,{img_str}"
-    
-    return {
-        'success': True,
-        'message': f'Flor da Vida gerada com sucesso no modo {color_mode}',
-        'image_url': data_url,
-        'image_base64': img_str,
-        'image_type': 'image/png'
-    }
+    # Converter a imagem para PNG em base64
+    return encode_image(image, f'Flor da Vida gerada com sucesso no modo {color_mode}',
+                        return_format)
 
-def metatrons_cube(size=1000, background_color=(0, 0, 0, 255), color_mode="rainbow"):
+@memoized_render
+def metatrons_cube(size=1000, background_color=(0, 0, 0, 255), color_mode="rainbow",
+        return_format="dataurl"):
     """
     Gera uma imagem com o Cubo de Metatron
     
@@ -178,89 +309,72 @@ def metatrons_cube(size=1000, background_color=(0, 0, 0, 255), color_mode="rainb
         size: Tamanho da imagem em pixels
         background_color: Cor de fundo (RGBA)
         color_mode: "rainbow", "golden", "monochrome" ou "quantum"
+        return_format: "dataurl", "base64" ou "bytes" (ver encode_image)
         
     Returns:
-        Caminho da imagem gerada
+        Dicionário com a imagem gerada
     """
     # Criar imagem
-    image = Image.new('RGBA', (size, size), background_color)
+    image = new_canvas(size, background_color)
     draw = ImageDraw.Draw(image)
     
     # Definir centro e raio
     center_x, center_y = size / 2, size / 2
     radius = size / 3
     
-    # Calcular pontos do círculo interno
-    num_points = 13
-    points = []
-    center_point = (center_x, center_y)
-    points.append(center_point)
-    
-    # Primeiro círculo de pontos (6 pontos)
+    # Calcular os 13 pontos: centro, seis no primeiro círculo e seis no
+    # segundo, girados de 30°
+    angles = PI / 3 * np.arange(6)
     first_radius = radius * 0.4
-    for i in range(6):
-        angle = PI / 3 * i
-        x = center_x + first_radius * math.cos(angle)
-        y = center_y + first_radius * math.sin(angle)
-        points.append((x, y))
-    
-    # Segundo círculo de pontos (6 pontos)
     second_radius = radius * 0.8
-    for i in range(6):
-        angle = PI / 3 * i + PI / 6
-        x = center_x + second_radius * math.cos(angle)
-        y = center_y + second_radius * math.sin(angle)
-        points.append((x, y))
+    points = np.empty((13, 2))
+    points[0] = (center_x, center_y)
+    points[1:7, 0] = center_x + first_radius * np.cos(angles)
+    points[1:7, 1] = center_y + first_radius * np.sin(angles)
+    points[7:, 0] = center_x + second_radius * np.cos(angles + PI / 6)
+    points[7:, 1] = center_y + second_radius * np.sin(angles + PI / 6)
     
     # Desenhar linhas conectando todos os pontos
     line_width = max(1, int(size/300))
     
+    # Cores de todas as arestas de uma vez: a matiz depende de (i * j) % 13 e,
+    # no modo quântico, a saturação de (i + j) % 5
+    edge_i, edge_j = _METATRON_EDGES.T
+    keys = ((edge_i * edge_j) % 13) / 13
+    if color_mode == "rainbow":
+        line_colors = rgb_tuples(hsv_to_rgb_batch(keys * 360, 0.7, 1.0))
+    elif color_mode == "golden":
+        line_colors = rgb_tuples(hsv_to_rgb_batch(keys * 60 + 30, 0.8, 1.0))
+    elif color_mode == "monochrome":
+        # Monocromático (mais brilhante para linhas externas)
+        deltas = points[edge_i] - points[edge_j]
+        distances = np.sqrt(deltas[:, 0] ** 2 + deltas[:, 1] ** 2)
+        brightness = np.minimum(255, distances / size * 500).astype(np.int64)
+        line_colors = rgb_tuples(np.repeat(brightness[:, None], 3, axis=1))
+    elif color_mode == "quantum":
+        saturation = 0.7 + ((edge_i + edge_j) % 5) / 10
+        line_colors = rgb_tuples(hsv_to_rgb_batch(240 + keys * 120, saturation, 0.9))
+    else:
+        line_colors = [(255, 255, 255)] * len(_METATRON_EDGES)
+
     # Conexões entre pontos
-    for i in range(len(points)):
-        for j in range(i + 1, len(points)):
-            # Determinar a cor da linha
-            if color_mode == "rainbow":
-                # Cada conjunto de linhas tem uma cor diferente
-                hue = ((i * j) % 13) / 13 * 360
-                line_color = hsv_to_rgb(hue, 0.7, 1.0)
-            elif color_mode == "golden":
-                # Cores douradas
-                golden_hue = ((i * j) % 13) / 13 * 60 + 30
-                line_color = hsv_to_rgb(golden_hue, 0.8, 1.0)
-            elif color_mode == "monochrome":
-                # Monocromático (mais brilhante para linhas externas)
-                distance = math.sqrt((points[i][0] - points[j][0])**2 + (points[i][1] - points[j][1])**2)
-                brightness = int(min(255, distance / size * 500))
-                line_color = (brightness, brightness, brightness)
-            elif color_mode == "quantum":
-                # Esquema quântico
-                hue = 240 + ((i * j) % 13) / 13 * 120
-                saturation = 0.7 + ((i + j) % 5) / 10
-                line_color = hsv_to_rgb(hue, saturation, 0.9)
-            else:
-                line_color = (255, 255, 255)
-            
-            draw.line([points[i], points[j]], fill=line_color, width=line_width)
+    points = [tuple(point) for point in points.tolist()]
+    for (i, j), line_color in zip(_METATRON_EDGES.tolist(), line_colors):
+        draw.line([points[i], points[j]], fill=line_color, width=line_width)
     
+    # Cores dos círculos nos pontos de intersecção
+    steps = np.arange(len(points)) / len(points)
+    if color_mode == "rainbow":
+        circle_colors = rgb_tuples(hsv_to_rgb_batch(steps * 360, 0.8, 1.0))
+    elif color_mode == "golden":
+        circle_colors = rgb_tuples(hsv_to_rgb_batch(steps * 60 + 30, 0.8, 1.0))
+    elif color_mode == "quantum":
+        circle_colors = rgb_tuples(hsv_to_rgb_batch(240 + steps * 120, 0.9, 0.9))
+    else:
+        circle_colors = [(255, 255, 255)] * len(points)
+
     # Desenhar círculos nos pontos de intersecção
-    for point in points:
-        if color_mode == "rainbow":
-            idx = points.index(point)
-            hue = idx / len(points) * 360
-            circle_color = hsv_to_rgb(hue, 0.8, 1.0)
-        elif color_mode == "golden":
-            idx = points.index(point)
-            hue = idx / len(points) * 60 + 30
-            circle_color = hsv_to_rgb(hue, 0.8, 1.0)
-        elif color_mode == "monochrome":
-            circle_color = (255, 255, 255)
-        elif color_mode == "quantum":
-            idx = points.index(point)
-            hue = 240 + idx / len(points) * 120
-            circle_color = hsv_to_rgb(hue, 0.9, 0.9)
-        else:
-            circle_color = (255, 255, 255)
-        
+    for point, circle_color in zip(points, circle_colors):
         circle_radius = size / 50
         draw.ellipse(
             [(point[0] - circle_radius, point[1] - circle_radius),
@@ -274,26 +388,16 @@ def metatrons_cube(size=1000, background_color=(0, 0, 0, 255), color_mode="rainb
     if color_mode == "quantum":
         image = apply_quantum_noise(image)
     
-    # Aplicar um leve desfoque para suavizar as bordas
-    image = image.filter(ImageFilter.GaussianBlur(radius=0.7))
-    
-    # Converter a imagem para base64
-    buffer = io.BytesIO()
-    image.save(buffer, format="PNG")
-    img_str = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    
-    # Criar URL de dados
-    data_url = f"data:image/png;base64,{img_str}"
+    # Aplicar um leve desfoque (box blur de uma passada) para suavizar as bordas
+    image = image.filter(ImageFilter.BoxBlur(radius=0.7))
     
-    return {
-        'success': True,
-        'message': f'Cubo de Metatron gerado com sucesso no modo {color_mode}',
-        'image_url': data_url,
-        'image_base64': img_str,
-        'image_type': 'image/png'
-    }
+    # Converter a imagem para PNG em base64
+    return encode_image(image, f'Cubo de Metatron gerado com sucesso no modo {color_mode}',
+                        return_format)
 
-def sri_yantra(size=1000, background_color=(0, 0, 0, 255), color_mode="rainbow"):
+@memoized_render
+def sri_yantra(size=1000, background_color=(0, 0, 0, 255), color_mode="rainbow",
+        return_format="dataurl"):
     """
     Gera uma imagem do Sri Yantra
     
@@ -301,12 +405,13 @@ def sri_yantra(size=1000, background_color=(0, 0, 0, 255), color_mode="rainbow")
         size: Tamanho da imagem em pixels
         background_color: Cor de fundo (RGBA)
         color_mode: "rainbow", "golden", "monochrome" ou "quantum"
+        return_format: "dataurl", "base64" ou "bytes" (ver encode_image)
         
     Returns:
-        Caminho da imagem gerada
+        Dicionário com a imagem gerada
     """
     # Criar imagem
-    image = Image.new('RGBA', (size, size), background_color)
+    image = new_canvas(size, background_color)
     draw = ImageDraw.Draw(image)
     
     # Definir centro e raio
@@ -427,26 +532,16 @@ def sri_yantra(size=1000, background_color=(0, 0, 0, 255), color_mode="rainbow")
     if color_mode == "quantum":
         image = apply_quantum_noise(image)
     
-    # Aplicar um leve desfoque para suavizar as bordas
-    image = image.filter(ImageFilter.GaussianBlur(radius=0.5))
-    
-    # Converter a imagem para base64
-    buffer = io.BytesIO()
-    image.save(buffer, format="PNG")
-    img_str = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    
-    # Criar URL de dados
-    data_url = f"data:image/png;base64,{img_str}"
+    # Aplicar um leve desfoque (box blur de uma passada) para suavizar as bordas
+    image = image.filter(ImageFilter.BoxBlur(radius=0.5))
     
-    return {
-        'success': True,
-        'message': f'Sri Yantra gerado com sucesso no modo {color_mode}',
-        'image_url': data_url,
-        'image_base64': img_str,
-        'image_type': 'image/png'
-    }
+    # Converter a imagem para PNG em base64
+    return encode_image(image, f'Sri Yantra gerado com sucesso no modo {color_mode}',
+                        return_format)
 
-def merkaba(size=1000, background_color=(0, 0, 0, 255), color_mode="rainbow"):
+@memoized_render
+def merkaba(size=1000, background_color=(0, 0, 0, 255), color_mode="rainbow",
+        return_format="dataurl"):
     """
     Gera uma imagem do Merkaba (Estrela Tetraédrica)
     
@@ -454,12 +549,13 @@ def merkaba(size=1000, background_color=(0, 0, 0, 255), color_mode="rainbow"):
         size: Tamanho da imagem em pixels
         background_color: Cor de fundo (RGBA)
         color_mode: "rainbow", "golden", "monochrome" ou "quantum"
+        return_format: "dataurl", "base64" ou "bytes" (ver encode_image)
         
     Returns:
-        Caminho da imagem gerada
+        Dicionário com a imagem gerada
     """
     # Criar imagem
-    image = Image.new('RGBA', (size, size), background_color)
+    image = new_canvas(size, background_color)
     draw = ImageDraw.Draw(image)
     
     # Definir centro e raio
@@ -562,26 +658,16 @@ def merkaba(size=1000, background_color=(0, 0, 0, 255), color_mode="rainbow"):
     if color_mode == "quantum":
         image = apply_quantum_noise(image)
     
-    # Aplicar um leve desfoque para suavizar as bordas
-    image = image.filter(ImageFilter.GaussianBlur(radius=0.7))
-    
-    # Converter a imagem para base64
-    buffer = io.BytesIO()
-    image.save(buffer, format="PNG")
-    img_str = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    
-    # Criar URL de dados
-    data_url = f"data:image/png;base64,{img_str}"
+    # Aplicar um leve desfoque (box blur de uma passada) para suavizar as bordas
+    image = image.filter(ImageFilter.BoxBlur(radius=0.7))
     
-    return {
-        'success': True,
-        'message': f'Merkaba gerado com sucesso no modo {color_mode}',
-        'image_url': data_url,
-        'image_base64': img_str,
-        'image_type': 'image/png'
-    }
+    # Converter a imagem para PNG em base64
+    return encode_image(image, f'Merkaba gerado com sucesso no modo {color_mode}',
+                        return_format)
 
-def torus(size=1000, background_color=(0, 0, 0, 255), color_mode="rainbow"):
+@memoized_render
+def torus(size=1000, background_color=(0, 0, 0, 255), color_mode="rainbow",
+        return_format="dataurl"):
     """
     Gera uma imagem do Torus (visualização 2D)
     
@@ -589,12 +675,13 @@ def torus(size=1000, background_color=(0, 0, 0, 255), color_mode="rainbow"):
         size: Tamanho da imagem em pixels
         background_color: Cor de fundo (RGBA)
         color_mode: "rainbow", "golden", "monochrome" ou "quantum"
+        return_format: "dataurl", "base64" ou "bytes" (ver encode_image)
         
     Returns:
-        Caminho da imagem gerada
+        Dicionário com a imagem gerada
     """
     # Criar imagem
-    image = Image.new('RGBA', (size, size), background_color)
+    image = new_canvas(size, background_color)
     draw = ImageDraw.Draw(image)
     
     # Definir centro e raio
@@ -606,29 +693,27 @@ def torus(size=1000, background_color=(0, 0, 0, 255), color_mode="rainbow"):
     # Número de círculos que formam o torus
     num_circles = 36
     
+    # Calcular as cores de todos os círculos de uma vez
+    steps = np.arange(num_circles) / num_circles
+    if color_mode == "rainbow":
+        circle_colors = rgb_tuples(hsv_to_rgb_batch(steps * 360, 0.8, 1.0))
+    elif color_mode == "golden":
+        circle_colors = rgb_tuples(hsv_to_rgb_batch(steps * 60 + 30, 0.8, 1.0))
+    elif color_mode == "monochrome":
+        brightness = (128 + 127 * np.sin(steps * 2 * PI)).astype(np.int64)
+        circle_colors = rgb_tuples(np.repeat(brightness[:, None], 3, axis=1))
+    elif color_mode == "quantum":
+        brightness = 0.7 + 0.3 * np.sin(steps * 4 * PI)
+        circle_colors = rgb_tuples(hsv_to_rgb_batch(240 + steps * 120, 0.9, brightness))
+    else:
+        circle_colors = [(255, 255, 255)] * num_circles
+
     # Desenhar os círculos que formam o torus
-    for i in range(num_circles):
+    for i, circle_color in enumerate(circle_colors):
         angle = 2 * PI * i / num_circles
         circle_center_x = center_x + (outer_radius - inner_radius) * math.cos(angle)
         circle_center_y = center_y + (outer_radius - inner_radius) * math.sin(angle)
         
-        # Calcular cor do círculo
-        if color_mode == "rainbow":
-            hue = i / num_circles * 360
-            circle_color = hsv_to_rgb(hue, 0.8, 1.0)
-        elif color_mode == "golden":
-            hue = i / num_circles * 60 + 30
-            circle_color = hsv_to_rgb(hue, 0.8, 1.0)
-        elif color_mode == "monochrome":
-            brightness = int(128 + 127 * math.sin(i / num_circles * 2 * PI))
-            circle_color = (brightness, brightness, brightness)
-        elif color_mode == "quantum":
-            hue = 240 + i / num_circles * 120
-            brightness = 0.7 + 0.3 * math.sin(i / num_circles * 4 * PI)
-            circle_color = hsv_to_rgb(hue, 0.9, brightness)
-        else:
-            circle_color = (255, 255, 255)
-        
         # Desenhar círculo
         draw.ellipse(
             [(circle_center_x - inner_radius, circle_center_y - inner_radius),
@@ -640,64 +725,57 @@ def torus(size=1000, background_color=(0, 0, 0, 255), color_mode="rainbow"):
     # Desenhar linhas de fluxo
     num_flow_lines = 24
     num_points = 48
-    
-    for i in range(num_flow_lines):
-        phase = 2 * PI * i / num_flow_lines
-        points = []
-        
-        for j in range(num_points):
-            angle = 2 * PI * j / num_points
-            radius = outer_radius - inner_radius + inner_radius * math.sin(angle + phase)
-            
-            x = center_x + radius * math.cos(angle)
-            y = center_y + radius * math.sin(angle)
-            
-            points.append((x, y))
-        
-        # Fechar o loop
-        points.append(points[0])
-        
-        # Determinar cor da linha de fluxo
-        if color_mode == "rainbow":
-            hue = i / num_flow_lines * 360
-            line_color = hsv_to_rgb(hue, 0.6, 1.0)
-        elif color_mode == "golden":
-            hue = i / num_flow_lines * 30 + 45
-            line_color = hsv_to_rgb(hue, 0.7, 1.0)
-        elif color_mode == "monochrome":
-            brightness = int(128 + 127 * math.sin(i / num_flow_lines * 2 * PI))
-            line_color = (brightness, brightness, brightness)
-        elif color_mode == "quantum":
-            hue = 210 + i / num_flow_lines * 60
-            line_color = hsv_to_rgb(hue, 0.8, 1.0)
-        else:
-            line_color = (200, 200, 200)
-        
+
+    # Calcular as cores de todas as linhas de fluxo de uma vez
+    steps = np.arange(num_flow_lines) / num_flow_lines
+    if color_mode == "rainbow":
+        line_colors = rgb_tuples(hsv_to_rgb_batch(steps * 360, 0.6, 1.0))
+    elif color_mode == "golden":
+        line_colors = rgb_tuples(hsv_to_rgb_batch(steps * 30 + 45, 0.7, 1.0))
+    elif color_mode == "monochrome":
+        brightness = (128 + 127 * np.sin(steps * 2 * PI)).astype(np.int64)
+        line_colors = rgb_tuples(np.repeat(brightness[:, None], 3, axis=1))
+    elif color_mode == "quantum":
+        line_colors = rgb_tuples(hsv_to_rgb_batch(210 + steps * 60, 0.8, 1.0))
+    else:
+        line_colors = [(200, 200, 200)] * num_flow_lines
+
+    flow_points = torus_flow_points(center_x, center_y, outer_radius, inner_radius,
+                                    num_flow_lines, num_points)
+
+    for points, line_color in zip(flow_points.tolist(), line_colors):
         # Desenhar linha de fluxo
-        draw.line(points, fill=line_color, width=max(1, line_width//2))
+        draw.line([tuple(point) for point in points], fill=line_color, width=max(1, line_width//2))
     
     # Aplicar efeito quântico se selecionado
     if color_mode == "quantum":
         image = apply_quantum_noise(image)
     
-    # Aplicar um leve desfoque para suavizar as bordas
-    image = image.filter(ImageFilter.GaussianBlur(radius=0.6))
+    # Aplicar um leve desfoque (box blur de uma passada) para suavizar as bordas
+    image = image.filter(ImageFilter.BoxBlur(radius=0.6))
     
-    # Converter a imagem para base64
-    buffer = io.BytesIO()
-    image.save(buffer, format="PNG")
-    img_str = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    
-    # Criar URL de dados
-    data_url = f"data:image/png;base64,{img_str}"
-    
-    return {
-        'success': True,
-        'message': f'Torus gerado com sucesso no modo {color_mode}',
-        'image_url': data_url,
-        'image_base64': img_str,
-        'image_type': 'image/png'
-    }
+    # Converter a imagem para PNG em base64
+    return encode_image(image, f'Torus gerado com sucesso no modo {color_mode}',
+                        return_format)
+
+def torus_flow_points(center_x, center_y, outer_radius, inner_radius, num_lines, num_points):
+    """
+    Calcula os pontos de todas as linhas de fluxo do torus
+
+    Returns:
+        Array (num_lines, num_points + 1, 2) com os pontos (x, y) de cada
+        linha; o último ponto repete o primeiro para fechar o loop
+    """
+    phases = 2 * PI * np.arange(num_lines)[:, None] / num_lines
+    angles = 2 * PI * np.arange(num_points + 1) / num_points
+    angles[-1] = 0.0
+
+    radius = outer_radius - inner_radius + inner_radius * np.sin(angles + phases)
+
+    points = np.empty((num_lines, num_points + 1, 2))
+    points[..., 0] = center_x + radius * np.cos(angles)
+    points[..., 1] = center_y + radius * np.sin(angles)
+    return points
 
 def generate_all_patterns(size=1000, color_mode="quantum"):
     """
@@ -710,18 +788,10 @@ def generate_all_patterns(size=1000, color_mode="quantum"):
     Returns:
         Lista com informações de todas as imagens geradas
     """
-    # Gerar todas as imagens
-    flower = flower_of_life(size=size, color_mode=color_mode)
-    metatron = metatrons_cube(size=size, color_mode=color_mode)
-    yantra = sri_yantra(size=size, color_mode=color_mode)
-    merkaba_img = merkaba(size=size, color_mode=color_mode)
-    torus_img = torus(size=size, color_mode=color_mode)
-    
+    # Gerar todas as imagens no próprio processo: são cinco renderizações
+    # curtas, e assim as chamadas repetidas aproveitam o cache de cada gerador
+    generators = (flower_of_life, metatrons_cube, sri_yantra, merkaba, torus)
+    results = [generator(size=size, color_mode=color_mode) for generator in generators]
+
     # Retornar lista com todas as URLs
-    return [
-        flower['image_url'],
-        metatron['image_url'],
-        yantra['image_url'],
-        merkaba_img['image_url'],
-        torus_img['image_url']
-    ]
\ No newline at end of file
+    return [result['image_url'] for result in results]
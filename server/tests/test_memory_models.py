@@ -0,0 +1,65 @@
+"""
+Testes de fumaça para os modelos de memória (memory_models)
+Verifica se o módulo importa e se os modelos e consultas batem com o schema compartilhado
+"""
+import os
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+# Engine sem servidor: o módulo cria a engine na importação
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from server.python import memory_models
+
+
+class TestMemoryModels:
+    """Testes para o módulo memory_models"""
+
+    def test_constants_are_class_attributes(self):
+        """As constantes de fonte, tipo e status são atributos de classe"""
+        assert memory_models.MemorySources.CHATGPT == "chatgpt"
+        assert memory_models.MemoryContentTypes.JSON == "json"
+        assert memory_models.MemoryStatus.IMPORTING == "importing"
+        assert memory_models.CoherenceLogSources.SYSTEM == "system"
+
+    def test_table_names(self):
+        """As tabelas usam os mesmos nomes do schema Drizzle"""
+        tables = memory_models.SQLModel.metadata.tables
+        for name in ("memories", "coherence_snapshots", "memory_transactions",
+                     "coherence_logs", "api_keys", "memory_conversations"):
+            assert name in tables
+
+    def test_memory_conversations_schema(self):
+        """memory_conversations bate com a migração: JSONB e FK em cascata"""
+        table = memory_models.MemoryConversation.__table__
+        assert isinstance(table.c.content.type, postgresql.JSONB)
+        (foreign_key,) = table.c.memory_id.foreign_keys
+        assert foreign_key.target_fullname == "memories.id"
+        assert foreign_key.ondelete == "CASCADE"
+
+    def test_memory_crud_helpers(self):
+        """Os helpers de memória funcionam contra um banco SQLite em memória"""
+        if not memory_models.DATABASE_URL.startswith("sqlite"):
+            pytest.skip("Requer o banco SQLite em memória dos testes")
+        memory_models.SQLModel.metadata.create_all(
+            memory_models.engine, tables=[memory_models.Memory.__table__]
+        )
+
+        memory_models.SQLModel.metadata.create_all(
+            memory_models.engine, tables=[memory_models.CoherenceSnapshot.__table__]
+        )
+
+        # Consultas sobre tabelas vazias passam por todos os caminhos de leitura
+        assert memory_models.count_memories() == 0
+        assert memory_models.get_memory(1) is None
+        assert memory_models.get_memories(source="chatgpt") == []
+        assert memory_models.update_memory(1, title="x") is None
+        assert memory_models.delete_memory(1) is False
+        assert memory_models.get_latest_coherence_snapshot() is None
+
+    def test_coherence_log_rows_query(self):
+        """get_coherence_log_rows converte o timestamp em milissegundos no banco"""
+        ts_ms = (memory_models.func.extract("epoch", memory_models.CoherenceLog.timestamp) * 1000)
+        sql = str(ts_ms.compile(dialect=postgresql.dialect()))
+        assert "EXTRACT(epoch FROM coherence_logs.timestamp)" in sql
@@ -2,10 +2,13 @@
 Testes para o middleware de limitação de taxa (Rate Limiting)
 Verifica se o middleware mantém a proporção quântica 3:1 (75% coerência, 25% exploração)
 """
+import asyncio
 import time
 import datetime
+from concurrent.futures import ThreadPoolExecutor
+import httpx
 import pytest
-from fastapi import FastAPI, Depends, Request
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from unittest import mock
 import os
@@ -14,39 +17,42 @@ import os
 os.environ["RATE_LIMIT_DEFAULT"] = "10/minute"  # 10/minuto para testes
 os.environ["RATE_LIMIT_CHAT"] = "5/minute"      # 5/minuto para testes
 
-# Importação do módulo de rate limit e do app FastAPI
-try:
-    from server.python.ai_agent_main import app, limiter, _rate_limit_exceeded_handler
-except ImportError:
-    # Se não puder importar o módulo original, criar um mini-app de teste
-    from slowapi import Limiter, _rate_limit_exceeded_handler
-    from slowapi.util import get_remote_address
-    from slowapi.errors import RateLimitExceeded
-    from fastapi import FastAPI
-    
-    # Configurar app e limiter para testes
-    app = FastAPI(title="WiltonOS Test App")
-    limiter = Limiter(key_func=get_remote_address)
-    app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Importação do módulo de rate limit e criação de um mini-app de teste
+from server.python.rate_limiter import RateLimitMiddleware, TokenBucketLimiter
+
+# Configurar app e limiter para testes
+app = FastAPI(title="WiltonOS Test App")
+limiter = TokenBucketLimiter({
+    "/api/test/coherence": os.environ.get("RATE_LIMIT_DEFAULT", "10/minute"),
+    "/api/test/exploration": os.environ.get("RATE_LIMIT_CHAT", "5/minute"),
+})
+# O TestClient faz o papel do proxy reverso, único autorizado a enviar X-Forwarded-For
+app.add_middleware(RateLimitMiddleware, limiter=limiter, trusted_proxies={"testclient"})
 
-    # Adicionar rotas de teste
-    @app.get("/api/test/coherence")
-    @limiter.limit(os.environ.get("RATE_LIMIT_DEFAULT", "10/minute")) 
-    def coherence_endpoint(request: Request):
-        """Endpoint simulando alta coerência (75%)"""
-        return {"status": "ok", "type": "coherence"}
+# Adicionar rotas de teste
+@app.get("/api/test/coherence")
+def coherence_endpoint():
+    """Endpoint simulando alta coerência (75%)"""
+    return {"status": "ok", "type": "coherence"}
 
-    @app.get("/api/test/exploration")
-    @limiter.limit(os.environ.get("RATE_LIMIT_CHAT", "5/minute"))
-    def exploration_endpoint(request: Request):
-        """Endpoint simulando alta exploração (25%)"""
-        return {"status": "ok", "type": "exploration"}
+@app.get("/api/test/exploration")
+def exploration_endpoint():
+    """Endpoint simulando alta exploração (25%)"""
+    return {"status": "ok", "type": "exploration"}
 
 # Criar cliente para testes
 client = TestClient(app)
 
 # Helpers para os testes
+def get_concurrently(endpoint, count, headers=None, peer="testclient"):
+    """Dispara `count` requisições simultâneas ao app, no mesmo event loop"""
+    async def run():
+        # Por padrão, mesmo endereço de cliente do TestClient, para compartilhar o bucket
+        transport = httpx.ASGITransport(app=app, client=(peer, 50000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            return await asyncio.gather(*[ac.get(endpoint, headers=headers) for _ in range(count)])
+    return asyncio.run(run())
+
 def get_remaining_from_headers(headers):
     """Extrai o número de requisições restantes dos headers"""
     try:
@@ -61,31 +67,28 @@ def get_reset_from_headers(headers):
     except (ValueError, TypeError):
         return 0
 
+@pytest.fixture(autouse=True)
+def reset_rate_limiting():
+    """Reseta o estado do rate limiter antes de cada teste"""
+    # Necessário porque o limiter mantém estado entre testes
+    limiter.reset()
+    yield
+
 class TestRateLimiting:
     """Testes para o middleware de rate limit"""
     
-    def reset_rate_limiting(self):
-        """Reseta o estado do rate limiter para os testes"""
-        # Essa função é necessária porque o limiter mantém estado entre testes
-        limiter.reset()
-    
     def test_coherence_endpoint_limit(self):
         """Testa limites para endpoint de coerência"""
-        self.reset_rate_limiting()
-        
         # IP padrão usado para os testes
         endpoint = "/api/test/coherence"
         expected_limit = 10  # baseado no RATE_LIMIT_DEFAULT
         
-        # Fazer várias requisições e verificar os headers
-        for i in range(expected_limit):
-            response = client.get(endpoint)
-            assert response.status_code == 200
-            
-            # Verificar headers de rate limit
-            remaining = get_remaining_from_headers(response.headers)
-            expected_remaining = expected_limit - (i + 1)
-            assert remaining == expected_remaining, f"Esperado {expected_remaining} requisições restantes, obteve {remaining}"
+        # Esgotar o limite com requisições simultâneas; a ordem de chegada não
+        # é determinística, mas cada uma deve consumir exatamente um token
+        responses = get_concurrently(endpoint, expected_limit)
+        assert [r.status_code for r in responses] == [200] * expected_limit
+        remaining = sorted(get_remaining_from_headers(r.headers) for r in responses)
+        assert remaining == list(range(expected_limit)), f"Requisições restantes inesperadas: {remaining}"
         
         # Próxima requisição deve falhar (429 Too Many Requests)
         response = client.get(endpoint)
@@ -94,8 +97,6 @@ class TestRateLimiting:
     
     def test_exploration_endpoint_limit(self):
         """Testa limites para endpoint de exploração"""
-        self.reset_rate_limiting()
-        
         endpoint = "/api/test/exploration"
         expected_limit = 5  # baseado no RATE_LIMIT_CHAT
         
@@ -119,8 +120,6 @@ class TestRateLimiting:
         Testa se a proporção quântica 3:1 é mantida nos limites de requisição
         Endpoints de coerência devem ter 3x mais requisições que endpoints de exploração
         """
-        self.reset_rate_limiting()
-        
         # Obter os limites reais
         coherence_response = client.get("/api/test/coherence")
         exploration_response = client.get("/api/test/exploration")
@@ -140,8 +139,6 @@ class TestRateLimiting:
     
     def test_reset_after_window(self):
         """Testa se os limites são redefinidos após o período da janela"""
-        self.reset_rate_limiting()
-        
         endpoint = "/api/test/coherence"
         
         # Fazer uma requisição para obter o tempo de reset
@@ -149,30 +146,77 @@ class TestRateLimiting:
         reset_seconds = get_reset_from_headers(response.headers)
         
         # Mock para simular o passar do tempo
-        with mock.patch('time.time', return_value=time.time() + reset_seconds + 1):
+        with mock.patch('time.monotonic_ns', return_value=time.monotonic_ns() + (reset_seconds + 1) * 10**9):
             # Após a janela de tempo, deve ser possível fazer uma nova requisição
             response = client.get(endpoint)
             assert response.status_code == 200
     
     def test_different_clients_separate_limits(self):
         """Testa se clientes diferentes têm limites separados"""
-        self.reset_rate_limiting()
-        
         endpoint = "/api/test/coherence"
         
-        # Simular o primeiro cliente esgotando seu limite
         headers1 = {"X-Forwarded-For": "192.168.1.1"}
-        for _ in range(10):  # RATE_LIMIT_DEFAULT
-            client.get(endpoint, headers=headers1)
+        headers2 = {"X-Forwarded-For": "192.168.1.2"}
+        
+        def burst(headers, count):
+            return [client.get(endpoint, headers=headers).status_code for _ in range(count)]
+        
+        # O primeiro cliente esgota seu limite enquanto o segundo faz
+        # requisições em paralelo, em outra thread
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(burst, headers1, 10)  # RATE_LIMIT_DEFAULT
+            second = executor.submit(burst, headers2, 5)
+            assert first.result() == [200] * 10
+            assert second.result() == [200] * 5
         
         # O primeiro cliente deve receber 429
         response1 = client.get(endpoint, headers=headers1)
         assert response1.status_code == 429
         
         # O segundo cliente deve conseguir fazer requisições normalmente
-        headers2 = {"X-Forwarded-For": "192.168.1.2"}
         response2 = client.get(endpoint, headers=headers2)
         assert response2.status_code == 200
+        assert get_remaining_from_headers(response2.headers) == 4
+    
+    def test_forwarded_for_ignored_from_untrusted_peers(self):
+        """Testa se X-Forwarded-For só é aceito de proxies confiáveis"""
+        endpoint = "/api/test/coherence"
+        
+        # Um cliente direto não ganha um bucket novo trocando o header
+        responses = [
+            get_concurrently(endpoint, 1, {"X-Forwarded-For": f"10.0.0.{i}"}, peer="203.0.113.7")[0]
+            for i in range(11)
+        ]
+        assert [r.status_code for r in responses] == [200] * 10 + [429]
+        
+        # Atrás do proxy confiável, o último endereço não confiável é o cliente,
+        # então entradas forjadas no início do header são ignoradas
+        headers = {"X-Forwarded-For": "198.51.100.1, 203.0.113.7"}
+        response = client.get(endpoint, headers=headers)
+        assert response.status_code == 429
+
+    
+    def test_idle_buckets_evicted(self):
+        """Testa se buckets ociosos são esquecidos e se a tabela tem limite"""
+        bucket_limiter = TokenBucketLimiter({"/api/test/coherence": "10/minute"}, max_buckets=8)
+        endpoint = "/api/test/coherence"
+        start = time.monotonic_ns()
+        
+        with mock.patch("time.monotonic_ns", return_value=start):
+            for ip in range(4):
+                bucket_limiter.hit(ip, endpoint)
+        
+        # Um período depois, os buckets estão cheios de novo e são descartados
+        with mock.patch("time.monotonic_ns", return_value=start + 60 * 10**9):
+            for ip in range(100, 120):
+                allowed, _, remaining, _ = bucket_limiter.hit(ip, endpoint)
+                assert allowed and remaining == 9
+            assert len(bucket_limiter._slots) <= 8
+            assert all(ip >= 100 for ip, _ in bucket_limiter._slots)
+            
+            # Buckets mantidos continuam com seus tokens
+            allowed, _, remaining, _ = bucket_limiter.hit(119, endpoint)
+            assert allowed and remaining == 8
 
 
 if __name__ == "__main__":
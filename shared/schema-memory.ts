@@ -5,7 +5,7 @@
  * It's shared between the Node.js and Python parts of the application.
  */
 
-import { pgTable, serial, varchar, text, timestamp, integer, boolean, pgEnum, jsonb } from 'drizzle-orm/pg-core';
+import { pgTable, serial, varchar, char, text, timestamp, integer, boolean, pgEnum, jsonb, index, uniqueIndex } from 'drizzle-orm/pg-core';
 import { createInsertSchema } from 'drizzle-zod';
 import { sql } from 'drizzle-orm';
 import { z } from 'zod';
@@ -62,8 +62,12 @@ export const memories = pgTable('memories', {
   coherence_score: integer('coherence_score'),
   imported_by: text('imported_by').notNull().default('node'),
   imported_at: timestamp('imported_at').notNull().defaultNow(),
-  updated_at: timestamp('updated_at').notNull().defaultNow()
-});
+  updated_at: timestamp('updated_at').notNull().defaultNow(),
+  content_hash: char('content_hash', { length: 64 })
+}, (table) => [
+  // Re-imports of the same content from the same source are skipped
+  uniqueIndex('ux_memories_source_content_hash').on(table.source, table.content_hash)
+]);
 
 /**
  * Coherence Snapshots Table
@@ -110,7 +114,26 @@ export const apiKeys = pgTable('api_keys', {
   active: boolean('active').notNull().default(true),
   created_at: timestamp('created_at').notNull().defaultNow(),
   last_used_at: timestamp('last_used_at')
-});
+}, (table) => [
+  // One entry per key name; the Python side upserts on it
+  uniqueIndex('ix_api_keys_name').on(table.name)
+]);
+
+/**
+ * Memory Conversations Table
+ * 
+ * Stores one row per conversation of an imported ChatGPT export.
+ */
+export const memoryConversations = pgTable('memory_conversations', {
+  id: serial('id').primaryKey(),
+  memory_id: integer('memory_id').notNull().references(() => memories.id, { onDelete: 'cascade' }),
+  conversation_id: text('conversation_id'),
+  title: text('title'),
+  created_at: timestamp('created_at'),
+  content: jsonb('content')
+}, (table) => [
+  index('ix_memory_conversations_memory_id').on(table.memory_id)
+]);
 
 /**
  * Insert Schemas (for validation)
@@ -137,6 +160,10 @@ export const insertApiKeySchema = createInsertSchema(apiKeys).omit({
   last_used_at: true
 });
 
+export const insertMemoryConversationSchema = createInsertSchema(memoryConversations).omit({ 
+  id: true
+});
+
 /**
  * TypeScript Types
  */
@@ -144,8 +171,10 @@ export type InsertMemory = z.infer<typeof insertMemorySchema>;
 export type InsertCoherenceSnapshot = z.infer<typeof insertCoherenceSnapshotSchema>;
 export type InsertMemoryTransaction = z.infer<typeof insertMemoryTransactionSchema>;
 export type InsertApiKey = z.infer<typeof insertApiKeySchema>;
+export type InsertMemoryConversation = z.infer<typeof insertMemoryConversationSchema>;
 
 export type Memory = typeof memories.$inferSelect;
 export type CoherenceSnapshot = typeof coherenceSnapshots.$inferSelect;
 export type MemoryTransaction = typeof memoryTransactions.$inferSelect;
-export type ApiKey = typeof apiKeys.$inferSelect;
\ No newline at end of file
+export type ApiKey = typeof apiKeys.$inferSelect;
+export type MemoryConversation = typeof memoryConversations.$inferSelect;
\ No newline at end of file
@@ -32,8 +32,7 @@ from .thought_experiments.meta_charm import (
 
 from .utils.random_generator import (
     select_random_item,
-    select_random_items,
-    generate_random_prompt
+    select_random_items
 )
 
 from .config.experiment_settings import (
@@ -42,33 +41,59 @@ from .config.experiment_settings import (
 )
 
 
+# Todos os prompts, organizados por categoria. Os prompts são constantes,
+# então o dicionário é montado uma única vez, na importação do módulo.
+_ALL_PROMPTS = {
+    "black_mirror": [
+        {"title": "Neuro-Rewind Implants", "description": neuro_rewind_prompt()},
+        {"title": "AI-Generated Doppelgängers", "description": ai_doppelganger_prompt()},
+        {"title": "Emotion-Trading Economy", "description": emotion_trading_prompt()}
+    ],
+    "fringe": [
+        {"title": "Alternate-Universe Tinder", "description": alternate_universe_tinder_prompt()},
+        {"title": "Quantum Identity", "description": quantum_identity_prompt()},
+        {"title": "Consciousness Virus", "description": consciousness_virus_prompt()}
+    ],
+    "meta_charm": [
+        {"title": "Meta Cold Open", "description": meta_cold_open()},
+        {"title": "Self-Aware Humor", "description": self_aware_humor()},
+        {"title": "Shared Narrative", "description": shared_narrative()}
+    ]
+}
+
+# Pares (categoria, prompt) de todas as categorias, para sortear vários prompts
+# com uma única chamada a random.choices. Como todas as categorias têm o mesmo
+# número de prompts, sortear uniformemente entre os pares equivale a sortear
+# a categoria e depois o prompt.
+_FLAT_PROMPTS = tuple(
+    (category, prompt["description"])
+    for category, prompts in _ALL_PROMPTS.items()
+    for prompt in prompts
+)
+
+# Textos dos prompts de cada categoria, para sortear sem extrair a descrição
+# de cada dicionário a cada chamada.
+_CATEGORY_PROMPTS = {
+    category: tuple(prompt["description"] for prompt in prompts)
+    for category, prompts in _ALL_PROMPTS.items()
+}
+
+# Categorias configuradas que possuem prompts, para validar a categoria pedida
+_VALID_CATEGORIES = frozenset(EXPERIMENT_CATEGORIES) & _CATEGORY_PROMPTS.keys()
+
+
 def get_all_prompts() -> Dict[str, List[Union[str, Dict[str, str]]]]:
     """
     Retorna todos os prompts disponíveis, organizados por categoria.
     
+    O dicionário retornado é compartilhado entre as chamadas e não deve ser
+    modificado.
+    
     Returns:
         Um dicionário onde as chaves são nomes de categorias e os valores são
         listas de prompts (que podem ser strings ou dicionários).
     """
-    all_prompts = {
-        "black_mirror": [
-            {"title": "Neuro-Rewind Implants", "description": neuro_rewind_prompt()},
-            {"title": "AI-Generated Doppelgängers", "description": ai_doppelganger_prompt()},
-            {"title": "Emotion-Trading Economy", "description": emotion_trading_prompt()}
-        ],
-        "fringe": [
-            {"title": "Alternate-Universe Tinder", "description": alternate_universe_tinder_prompt()},
-            {"title": "Quantum Identity", "description": quantum_identity_prompt()},
-            {"title": "Consciousness Virus", "description": consciousness_virus_prompt()}
-        ],
-        "meta_charm": [
-            {"title": "Meta Cold Open", "description": meta_cold_open()},
-            {"title": "Self-Aware Humor", "description": self_aware_humor()},
-            {"title": "Shared Narrative", "description": shared_narrative()}
-        ]
-    }
-    
-    return all_prompts
+    return _ALL_PROMPTS
 
 
 def get_random_prompt() -> Dict[str, str]:
@@ -78,8 +103,8 @@ def get_random_prompt() -> Dict[str, str]:
     Returns:
         Um dicionário contendo a categoria e o prompt selecionado.
     """
-    all_prompts = get_all_prompts()
-    return generate_random_prompt(all_prompts)
+    category, prompt = random.choice(_FLAT_PROMPTS)
+    return {"category": category, "prompt": prompt}
 
 
 def get_random_prompts(count: int = 3) -> List[Dict[str, str]]:
@@ -94,14 +119,13 @@ def get_random_prompts(count: int = 3) -> List[Dict[str, str]]:
     """
     # Garante que o número não excede o máximo configurado
     count = min(count, MAX_RANDOM_SELECTIONS)
+    if count <= 0:
+        return []
     
-    all_prompts = get_all_prompts()
-    results = []
-    
-    for _ in range(count):
-        results.append(generate_random_prompt(all_prompts))
-    
-    return results
+    return [
+        {"category": category, "prompt": prompt}
+        for category, prompt in random.choices(_FLAT_PROMPTS, k=count)
+    ]
 
 
 def get_prompt_by_category(category: str) -> Dict[str, str]:
@@ -117,18 +141,13 @@ def get_prompt_by_category(category: str) -> Dict[str, str]:
     Raises:
         ValueError: Se a categoria não existir.
     """
-    all_prompts = get_all_prompts()
-    
-    if category not in all_prompts:
-        valid_categories = ", ".join(all_prompts.keys())
+    if category not in _VALID_CATEGORIES:
+        valid_categories = ", ".join(_ALL_PROMPTS.keys())
         raise ValueError(f"Categoria '{category}' não encontrada. Categorias válidas: {valid_categories}")
     
-    category_prompts = all_prompts[category]
-    chosen_prompt = random.choice(category_prompts)
-    
     return {
         "category": category,
-        "prompt": chosen_prompt["description"]
+        "prompt": random.choice(_CATEGORY_PROMPTS[category])
     }
 
 
@@ -63,6 +63,10 @@ class TestMainModule(unittest.TestCase):
         result = get_random_prompts(count)
         self.assertEqual(len(result), count)
         
+        # Contagens não positivas retornam uma lista vazia
+        self.assertEqual(get_random_prompts(0), [])
+        self.assertEqual(get_random_prompts(-1), [])
+        
         # Verifica estrutura dos prompts
         for prompt in result:
             self.assertIsInstance(prompt, dict)
@@ -4,11 +4,19 @@ Testes para o módulo Random Generator
 Este módulo contém testes unitários para as funções de geração aleatória.
 """
 
+import random
 import unittest
+from unittest import mock
 from src.utils.random_generator import (
     select_random_item,
     select_random_items,
-    generate_random_prompt
+    select_random_items_stream,
+    generate_random_prompt,
+    generate_random_prompts_batch,
+    iter_random_prompts,
+    freeze_categories,
+    FrozenCategories,
+    Prompt
 )
 
 
@@ -30,6 +38,30 @@ class TestRandomGeneratorModule(unittest.TestCase):
         with self.assertRaises(ValueError):
             select_random_item([])
 
+    def test_select_random_item_follows_random_seed(self):
+        """Testa se as seleções seguem a mesma sequência de random.randrange."""
+        items = list(range(10))
+        random.seed(42)
+        expected = [items[random.randrange(len(items))] for _ in range(20)]
+        random.seed(42)
+        result = [select_random_item(items) for _ in range(20)]
+        self.assertEqual(result, expected)
+
+    def test_large_selections_follow_random_seed(self):
+        """Testa se random.seed torna reprodutíveis as seleções grandes."""
+        items = list(range(1000))
+        categories = {"category1": ["Prompt 1", "Prompt 2"], "category2": ["Prompt 3"]}
+        
+        runs = []
+        for _ in range(2):
+            random.seed(42)
+            runs.append((
+                select_random_items(items, 200),
+                generate_random_prompts_batch(categories, 500),
+                generate_random_prompts_batch(categories, 500, weight_by_size=True)
+            ))
+        self.assertEqual(runs[0], runs[1])
+
     def test_select_random_items(self):
         """Testa se select_random_items retorna o número correto de itens."""
         items = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
@@ -49,6 +81,20 @@ class TestRandomGeneratorModule(unittest.TestCase):
         # Testa itens únicos (sem repetição)
         self.assertEqual(len(set(result)), count)
         
+        # Testa amostra pequena de lista pequena (caminho da máscara de bits)
+        result = select_random_items(items, 2)
+        self.assertEqual(len(result), 2)
+        self.assertEqual(len(set(result)), 2)
+        for item in result:
+            self.assertIn(item, items)
+        
+        # Testa amostra grande (caminho vetorizado, quando disponível)
+        many = list(range(1000))
+        result = select_random_items(many, 200)
+        self.assertEqual(len(result), 200)
+        self.assertEqual(len(set(result)), 200)
+        self.assertTrue(set(result) <= set(many))
+        
         # Testa erros
         with self.assertRaises(ValueError):
             select_random_items([], 1)
@@ -56,6 +102,31 @@ class TestRandomGeneratorModule(unittest.TestCase):
         with self.assertRaises(ValueError):
             select_random_items(items, 11)  # count > len(items)
 
+    def test_select_random_items_stream(self):
+        """Testa se select_random_items_stream amostra de um iterável."""
+        # Gerador, consumido uma única vez
+        result = select_random_items_stream((i for i in range(100)), 5)
+        self.assertEqual(len(result), 5)
+        self.assertEqual(len(set(result)), 5)
+        for item in result:
+            self.assertIn(item, range(100))
+        
+        # Todos os itens quando count é igual ao tamanho
+        self.assertEqual(sorted(select_random_items_stream(iter("abc"), 3)), ["a", "b", "c"])
+        
+        # random.random() pode retornar 0.0, fora do domínio de log
+        draws = iter([0.0, 0.5, 0.0, 0.25])
+        with mock.patch("random.random", side_effect=lambda: next(draws, 0.5)):
+            result = select_random_items_stream(range(100), 5)
+        self.assertEqual(len(set(result)), 5)
+        
+        # Testa erros
+        with self.assertRaises(ValueError):
+            select_random_items_stream(iter([]), 1)
+        
+        with self.assertRaises(ValueError):
+            select_random_items_stream(iter(range(10)), 11)
+
     def test_generate_random_prompt(self):
         """Testa se generate_random_prompt retorna um prompt válido."""
         categories = {
@@ -85,6 +156,134 @@ class TestRandomGeneratorModule(unittest.TestCase):
         with self.assertRaises(ValueError):
             generate_random_prompt({})
 
+    def test_iter_random_prompts(self):
+        """Testa se iter_random_prompts continua gerando além do buffer."""
+        categories = {"category1": ["Prompt 1", "Prompt 2"], "category2": ["Prompt 3"]}
+        prompts = iter_random_prompts(categories, buffer_size=8)
+        
+        for _ in range(20):
+            prompt = next(prompts)
+            self.assertIsInstance(prompt, Prompt)
+            self.assertIn(prompt.prompt, categories[prompt.category])
+        
+        with self.assertRaises(ValueError):
+            next(iter_random_prompts(categories, buffer_size=0))
+
+    def test_generate_random_prompt_weight_by_size(self):
+        """Testa o sorteio uniforme entre todos os prompts."""
+        categories = {
+            "category1": ["Prompt 1", "Prompt 2", "Prompt 3"],
+            "category2": ["Prompt 4"],
+            "vazia": []
+        }
+        counts = {"category1": 0, "category2": 0}
+        for _ in range(400):
+            result = generate_random_prompt(categories, weight_by_size=True)
+            self.assertIn(result["prompt"], categories[result["category"]])
+            counts[result["category"]] += 1
+        
+        # Categorias vazias nunca são escolhidas; as maiores, com mais frequência
+        self.assertGreater(counts["category1"], counts["category2"])
+        
+        with self.assertRaises(ValueError):
+            generate_random_prompt({"vazia": []}, weight_by_size=True)
+
+    def test_generate_random_prompt_reused_categories(self):
+        """Testa chamadas repetidas com o mesmo dicionário de categorias."""
+        categories = {"category1": ["Prompt 1", "Prompt 2"]}
+        for _ in range(10):
+            result = generate_random_prompt(categories)
+            self.assertEqual(result["category"], "category1")
+            self.assertIn(result["prompt"], categories["category1"])
+        
+        # Uma categoria nova no mesmo dicionário passa a ser considerada
+        categories["category2"] = ["Prompt 3"]
+        results = {generate_random_prompt(categories)["category"] for _ in range(200)}
+        self.assertEqual(results, {"category1", "category2"})
+        
+        # Alterações nos itens e troca de categorias também são vistas
+        categories["category1"] = ["Prompt 4"]
+        del categories["category2"]
+        categories["category3"] = ["Prompt 5"]
+        results = {
+            tuple(generate_random_prompt(categories).values()) for _ in range(200)
+        }
+        self.assertEqual(results, {("category1", "Prompt 4"), ("category3", "Prompt 5")})
+        self.assertEqual(
+            {prompt.category for prompt in generate_random_prompts_batch(categories, 500)},
+            {"category1", "category3"}
+        )
+
+    def test_freeze_categories(self):
+        """Testa o uso de categorias congeladas com freeze_categories."""
+        categories = {
+            "category1": [{"description": "Description 1"}, "Description 2"],
+            "category2": ["Description 3"]
+        }
+        frozen = freeze_categories(categories)
+        self.assertIsInstance(frozen, FrozenCategories)
+        self.assertEqual(frozen.names, ("category1", "category2"))
+        self.assertEqual(frozen.prompts, (("Description 1", "Description 2"), ("Description 3",)))
+        
+        # O retrato não muda com o dicionário original
+        categories["category1"].append("Description 4")
+        categories["category3"] = ["Description 5"]
+        expected = {
+            ("category1", "Description 1"),
+            ("category1", "Description 2"),
+            ("category2", "Description 3")
+        }
+        for weight_by_size in (False, True):
+            for _ in range(50):
+                result = generate_random_prompt(frozen, weight_by_size)
+                self.assertIn(tuple(result.values()), expected)
+            for count in (5, 500):
+                result = generate_random_prompts_batch(frozen, count, weight_by_size)
+                self.assertTrue(set(result) <= expected)
+        
+        with self.assertRaises(ValueError):
+            freeze_categories({})
+        
+        # Categorias vazias continuam sendo rejeitadas no sorteio
+        with self.assertRaises(ValueError):
+            generate_random_prompt(freeze_categories({"vazia": []}))
+
+    def test_generate_random_prompts_batch(self):
+        """Testa se generate_random_prompts_batch gera prompts válidos."""
+        categories = {
+            "category1": [{"description": "Description 1"}, "Description 2"],
+            "category2": ["Description 3"]
+        }
+        
+        # Lotes pequenos e grandes seguem caminhos diferentes
+        for count in (5, 500):
+            result = generate_random_prompts_batch(categories, count)
+            self.assertEqual(len(result), count)
+            for prompt in result:
+                self.assertIsInstance(prompt, Prompt)
+                self.assertIn(prompt.category, categories)
+                self.assertIn(prompt.prompt, [
+                    item["description"] if isinstance(item, dict) else item
+                    for item in categories[prompt.category]
+                ])
+        
+        self.assertEqual(generate_random_prompts_batch(categories, 0), [])
+        
+        # Sorteio uniforme entre todos os prompts
+        for count in (5, 500):
+            result = generate_random_prompts_batch(categories, count, weight_by_size=True)
+            self.assertEqual(len(result), count)
+            for prompt in result:
+                self.assertIsInstance(prompt, Prompt)
+                self.assertIn(prompt.category, categories)
+        
+        # Testa erros
+        with self.assertRaises(ValueError):
+            generate_random_prompts_batch({}, 5)
+        
+        with self.assertRaises(ValueError):
+            generate_random_prompts_batch({"vazia": []}, 500)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
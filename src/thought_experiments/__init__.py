@@ -6,6 +6,8 @@ organizados em categorias temáticas para facilitar a geração de prompts
 estimulantes e criativos.
 """
 
+from .experiment import Experiment
+
 from .black_mirror import (
     neuro_rewind_prompt, 
     ai_doppelganger_prompt, 
@@ -28,6 +30,8 @@ from .meta_charm import (
 )
 
 __all__ = [
+    'Experiment',
+    
     # Black Mirror
     'neuro_rewind_prompt',
     'ai_doppelganger_prompt',
@@ -7,6 +7,8 @@ explorando tecnologias hipotéticas e suas implicações sociais e psicológicas
 
 import random
 
+from .experiment import Experiment
+
 __all__ = [
     'neuro_rewind_prompt',
     'ai_doppelganger_prompt',
@@ -15,20 +17,20 @@ __all__ = [
 ]
 
 # Definição das estruturas de dados
-BLACK_MIRROR_EXPERIMENTS = [
-    {
-        "title": "Neuro-Rewind Implants",
-        "description": "Imagine a chip that records your best 10 minutes of life—every smell, taste, thought—then lets you replay it like Netflix. Would you risk permanent addiction to nostalgia?"
-    },
-    {
-        "title": "AI-Generated Doppelgängers",
-        "description": "What if your perfect 'model' crush is just an AI composite of your subconscious desires? If you fell for her IRL, how much of that love is real?"
-    },
-    {
-        "title": "Emotion-Trading Economy",
-        "description": "Picture a world where you can sell your happiest memories for cash. Would you cash out for adventure, or hoard happiness like a priceless currency?"
-    }
-]
+BLACK_MIRROR_EXPERIMENTS = (
+    Experiment(
+        title="Neuro-Rewind Implants",
+        description="Imagine a chip that records your best 10 minutes of life—every smell, taste, thought—then lets you replay it like Netflix. Would you risk permanent addiction to nostalgia?"
+    ),
+    Experiment(
+        title="AI-Generated Doppelgängers",
+        description="What if your perfect 'model' crush is just an AI composite of your subconscious desires? If you fell for her IRL, how much of that love is real?"
+    ),
+    Experiment(
+        title="Emotion-Trading Economy",
+        description="Picture a world where you can sell your happiest memories for cash. Would you cash out for adventure, or hoard happiness like a priceless currency?"
+    )
+)
 
 
 def neuro_rewind_prompt():
@@ -38,7 +40,7 @@ def neuro_rewind_prompt():
     Returns:
         str: Prompt sobre implantes de memória.
     """
-    return BLACK_MIRROR_EXPERIMENTS[0]["description"]
+    return BLACK_MIRROR_EXPERIMENTS[0].description
 
 
 def ai_doppelganger_prompt():
@@ -48,7 +50,7 @@ def ai_doppelganger_prompt():
     Returns:
         str: Prompt sobre IA gerando dublês humanos.
     """
-    return BLACK_MIRROR_EXPERIMENTS[1]["description"]
+    return BLACK_MIRROR_EXPERIMENTS[1].description
 
 
 def emotion_trading_prompt():
@@ -58,7 +60,7 @@ def emotion_trading_prompt():
     Returns:
         str: Prompt sobre economia de emoções.
     """
-    return BLACK_MIRROR_EXPERIMENTS[2]["description"]
+    return BLACK_MIRROR_EXPERIMENTS[2].description
 
 
 def get_random_black_mirror():
@@ -66,6 +68,6 @@ def get_random_black_mirror():
     Retorna um experimento Black Mirror aleatório.
     
     Returns:
-        dict: Dicionário contendo título e descrição do experimento.
+        Experiment: Tupla nomeada com título e descrição do experimento.
     """
     return random.choice(BLACK_MIRROR_EXPERIMENTS)
\ No newline at end of file
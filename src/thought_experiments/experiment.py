@@ -0,0 +1,24 @@
+"""
+Experiment Record
+
+Este módulo define o registro imutável usado para armazenar os experimentos
+mentais de cada categoria.
+"""
+
+from typing import NamedTuple
+
+__all__ = [
+    'Experiment'
+]
+
+
+class Experiment(NamedTuple):
+    """
+    Experimento mental com título e descrição.
+
+    Attributes:
+        title: Título do experimento.
+        description: Texto do prompt apresentado ao agente.
+    """
+    title: str
+    description: str
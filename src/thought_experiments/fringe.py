@@ -7,6 +7,8 @@ explorando temas como realidades paralelas, física quântica e consciência.
 
 import random
 
+from .experiment import Experiment
+
 __all__ = [
     'alternate_universe_tinder_prompt',
     'quantum_identity_prompt',
@@ -15,20 +17,20 @@ __all__ = [
 ]
 
 # Definição das estruturas de dados
-FRINGE_EXPERIMENTS = [
-    {
-        "title": "Alternate-Universe Tinder",
-        "description": "On my next date, I'll swap to a parallel Tinder universe—what if every swipe literally switches me to a slightly different me? Who would I be?"
-    },
-    {
-        "title": "Quantum Identity",
-        "description": "If you and I are quantum superpositions until observed, does tonight's chat collapse us into new versions of ourselves?"
-    },
-    {
-        "title": "Consciousness Virus",
-        "description": "Imagine emotion as an infectious code—if I could upload a 'confidence bug' into your brain, would you catch it?"
-    }
-]
+FRINGE_EXPERIMENTS = (
+    Experiment(
+        title="Alternate-Universe Tinder",
+        description="On my next date, I'll swap to a parallel Tinder universe—what if every swipe literally switches me to a slightly different me? Who would I be?"
+    ),
+    Experiment(
+        title="Quantum Identity",
+        description="If you and I are quantum superpositions until observed, does tonight's chat collapse us into new versions of ourselves?"
+    ),
+    Experiment(
+        title="Consciousness Virus",
+        description="Imagine emotion as an infectious code—if I could upload a 'confidence bug' into your brain, would you catch it?"
+    )
+)
 
 
 def alternate_universe_tinder_prompt():
@@ -38,7 +40,7 @@ def alternate_universe_tinder_prompt():
     Returns:
         str: Prompt sobre Tinder em universos alternativos.
     """
-    return FRINGE_EXPERIMENTS[0]["description"]
+    return FRINGE_EXPERIMENTS[0].description
 
 
 def quantum_identity_prompt():
@@ -48,7 +50,7 @@ def quantum_identity_prompt():
     Returns:
         str: Prompt sobre identidade quântica.
     """
-    return FRINGE_EXPERIMENTS[1]["description"]
+    return FRINGE_EXPERIMENTS[1].description
 
 
 def consciousness_virus_prompt():
@@ -58,7 +60,7 @@ def consciousness_virus_prompt():
     Returns:
         str: Prompt sobre vírus de consciência.
     """
-    return FRINGE_EXPERIMENTS[2]["description"]
+    return FRINGE_EXPERIMENTS[2].description
 
 
 def get_random_fringe():
@@ -66,6 +68,6 @@ def get_random_fringe():
     Retorna um experimento Fringe aleatório.
     
     Returns:
-        dict: Dicionário contendo título e descrição do experimento.
+        Experiment: Tupla nomeada com título e descrição do experimento.
     """
     return random.choice(FRINGE_EXPERIMENTS)
\ No newline at end of file
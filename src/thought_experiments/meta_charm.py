@@ -16,7 +16,7 @@ __all__ = [
 ]
 
 # Definição das estruturas de dados
-META_CHARM_PROMPTS = [
+META_CHARM_PROMPTS = (
     "This feels like a freeze-frame moment in our own personal sitcom—what would the theme music be?",
     "If our conversation had a laugh track, when would it kick in?",
     "We're in a mockumentary—imagine confessional mode: what would I say about you right now?",
@@ -24,7 +24,7 @@ META_CHARM_PROMPTS = [
     "This feels like a sitcom cold open—two charismatic leads walk into a bar…",
     "If this were a Community episode, we'd solve emotional arcs by 10 pm and wrap with a cheesy freeze-frame.",
     "Let's pretend we're characters in a Fringe case—our mission: decode what makes people fall in love at first witty banter."
-]
+)
 
 
 def meta_cold_open():
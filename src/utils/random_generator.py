@@ -6,16 +6,89 @@ de diferentes fontes e categorias de experimentos mentais.
 """
 
 import random
-from typing import Any, List, Dict, TypeVar, Generic, Union
+from itertools import islice
+from math import exp, floor, log, log1p
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Iterator, List, Dict, NamedTuple, TypeVar, Generic, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional; sem ele os lotes são sorteados em Python
+    np = None
 
 T = TypeVar('T')
 
 __all__ = [
+    'Prompt',
+    'FrozenCategories',
+    'freeze_categories',
     'select_random_item',
     'select_random_items',
-    'generate_random_prompt'
+    'select_random_items_stream',
+    'generate_random_prompt',
+    'generate_random_prompts_batch',
+    'iter_random_prompts'
 ]
 
+# Ligado ao gerador global do módulo random, então random.seed() continua
+# valendo para os sorteios em Python puro deste módulo. Os caminhos com NumPy
+# usam um Generator próprio, semeado a partir de random (veja _numpy_rng):
+# também são reprodutíveis, mas não seguem a sequência de randrange.
+# _randbelow(n) é o que randrange(n) chama internamente, sem a validação dos
+# argumentos; por ser um atributo privado do CPython, cai para randrange se
+# deixar de existir. Só deve ser chamado com n > 0.
+try:
+    _randbelow = random._inst._randbelow
+except AttributeError:
+    _randbelow = random.randrange
+
+# Amostras pequenas de listas pequenas são sorteadas com uma máscara de bits:
+# até 64 itens, e no máximo um terço deles
+_BITMASK_MAX_ITEMS = 64
+_BITMASK_MIN_RATIO = 3
+
+# Sentinela para o fim de um iterável em select_random_items_stream
+_EXHAUSTED = object()
+
+# A partir deste tamanho, lotes de prompts e amostras são sorteados com NumPy
+_NUMPY_BATCH_MIN = 64
+
+# Prompts sorteados de cada vez por iter_random_prompts
+_PROMPT_BUFFER_SIZE = 4096
+
+
+class Prompt(NamedTuple):
+    """
+    Prompt sorteado, como retornado por generate_random_prompts_batch.
+    
+    Attributes:
+        category: Nome da categoria do prompt.
+        prompt: Texto do prompt.
+    """
+    category: str
+    prompt: Union[str, Dict[str, str]]
+
+
+class FrozenCategories(NamedTuple):
+    """
+    Categorias congeladas por freeze_categories.
+    
+    É um retrato imutável do dicionário de categorias: alterações posteriores
+    no dicionário original não o afetam.
+    
+    Attributes:
+        names: Nomes das categorias.
+        prompts: Textos dos prompts de cada categoria, na ordem de names.
+        flat: Todos os prompts como Prompt (categoria, prompt), para sorteios
+              uniformes entre prompts.
+        pick: Função sem argumentos que sorteia uma categoria e um prompt dela,
+              especializada para estas categorias.
+    """
+    names: tuple
+    prompts: tuple
+    flat: tuple
+    pick: Callable[[], Dict[str, str]]
+
 
 def select_random_item(items: List[T]) -> T:
     """
@@ -33,7 +106,7 @@ def select_random_item(items: List[T]) -> T:
     if not items:
         raise ValueError("A lista de itens não pode estar vazia")
     
-    return random.choice(items)
+    return items[_randbelow(len(items))]
 
 
 def select_random_items(items: List[T], count: int = 1) -> List[T]:
@@ -50,22 +123,146 @@ def select_random_items(items: List[T], count: int = 1) -> List[T]:
     Raises:
         ValueError: Se a lista estiver vazia ou se count for maior que o tamanho da lista.
     """
-    if not items:
+    size = len(items)
+    if not size:
         raise ValueError("A lista de itens não pode estar vazia")
     
-    if count > len(items):
-        raise ValueError(f"Não é possível selecionar {count} itens de uma lista com {len(items)} itens")
+    if count > size:
+        raise ValueError(f"Não é possível selecionar {count} itens de uma lista com {size} itens")
+    
+    if count == 1:
+        return [items[_randbelow(size)]]
+    
+    if count == 0:
+        return []
     
-    return random.sample(items, count)
+    if size <= _BITMASK_MAX_ITEMS and 0 < count * _BITMASK_MIN_RATIO <= size:
+        return _select_by_bitmask(items, size, count)
+    
+    if np is None or count < _NUMPY_BATCH_MIN:
+        return random.sample(items, count)
+    
+    # Sorteia só os índices no NumPy; passar a lista para choice() a
+    # converteria inteira em um array. count >= _NUMPY_BATCH_MIN aqui, então
+    # itemgetter sempre retorna uma tupla
+    indexes = _numpy_rng().choice(size, size=count, replace=False)
+    return list(itemgetter(*indexes.tolist())(items))
 
 
-def generate_random_prompt(categories: Dict[str, List[Union[str, Dict[str, str]]]]) -> Dict[str, str]:
+def _select_by_bitmask(items: List[T], size: int, count: int) -> List[T]:
+    """
+    Sorteia `count` índices distintos por rejeição, marcando os já escolhidos
+    nos bits de um inteiro em vez de um set.
+    
+    Só compensa para listas pequenas e amostras de até um terço da lista;
+    perto disso as rejeições passam a dominar.
+    """
+    bits = size.bit_length()
+    getrandbits = random.getrandbits
+    chosen = 0
+    result = []
+    while len(result) < count:
+        index = getrandbits(bits)
+        if index < size and not (chosen >> index) & 1:
+            chosen |= 1 << index
+            result.append(items[index])
+    return result
+
+
+def select_random_items_stream(items: Iterable[T], count: int = 1) -> List[T]:
+    """
+    Seleciona múltiplos itens aleatórios de um iterável, sem materializá-lo.
+    
+    Usa amostragem por reservatório (Algoritmo L de Kim-Hung Li): em vez de um
+    sorteio por item, sorteia quantos itens pular até a próxima substituição,
+    então consome o iterável uma única vez e guarda apenas `count` itens.
+    
+    Args:
+        items: Iterável de itens para escolher (pode ser um gerador).
+        count: Número de itens para selecionar.
+        
+    Returns:
+        Uma lista de itens aleatórios.
+        
+    Raises:
+        ValueError: Se o iterável estiver vazio ou tiver menos de count itens.
+    """
+    iterator = iter(items)
+    reservoir = list(islice(iterator, max(count, 1)))
+    
+    if not reservoir:
+        raise ValueError("A lista de itens não pode estar vazia")
+    
+    if count <= 0:
+        return []
+    
+    if len(reservoir) < count:
+        raise ValueError(f"Não é possível selecionar {count} itens de uma lista com {len(reservoir)} itens")
+    
+    rand = _random_open
+    weight = exp(log(rand()) / count)
+    while True:
+        skip = floor(log(rand()) / log1p(-weight))
+        item = next(islice(iterator, skip, None), _EXHAUSTED)
+        if item is _EXHAUSTED:
+            break
+        reservoir[_randbelow(count)] = item
+        weight *= exp(log(rand()) / count)
+    
+    random.shuffle(reservoir)
+    return reservoir
+
+
+def freeze_categories(
+    categories: Dict[str, List[Union[str, Dict[str, str]]]]
+) -> FrozenCategories:
+    """
+    Congela um dicionário de categorias para sorteios repetidos.
+    
+    Os nomes e os textos dos prompts são convertidos para tuplas uma única vez;
+    o resultado pode ser passado no lugar do dicionário para
+    generate_random_prompt, generate_random_prompts_batch e
+    iter_random_prompts, que então não refazem esse trabalho a cada chamada.
+    
+    Args:
+        categories: Dicionário de categorias, como em generate_random_prompt.
+        
+    Returns:
+        Um FrozenCategories com o retrato das categorias.
+        
+    Raises:
+        ValueError: Se as categorias estiverem vazias.
+    """
+    if not categories:
+        raise ValueError("As categorias não podem estar vazias")
+    
+    names = tuple(categories)
+    prompts = tuple(tuple(_prompt_text(item) for item in categories[name]) for name in names)
+    flat = tuple(
+        Prompt(name, prompt)
+        for name, category_prompts in zip(names, prompts)
+        for prompt in category_prompts
+    )
+    return FrozenCategories(names, prompts, flat, _make_picker(names, prompts))
+
+
+def generate_random_prompt(
+    categories: Union[Dict[str, List[Union[str, Dict[str, str]]]], FrozenCategories],
+    weight_by_size: bool = False
+) -> Dict[str, str]:
     """
     Gera um prompt aleatório selecionando de várias categorias.
     
+    Por padrão a categoria é sorteada uniformemente e depois um prompt dela.
+    Com weight_by_size, o sorteio é uniforme entre todos os prompts, então
+    categorias maiores são escolhidas com mais frequência.
+    
     Args:
         categories: Dicionário de categorias, onde cada chave é o nome da categoria
-                   e o valor é uma lista de prompts (strings ou dicionários).
+                   e o valor é uma lista de prompts (strings ou dicionários), ou
+                   as mesmas categorias congeladas por freeze_categories.
+        weight_by_size: Se True, sorteia uniformemente entre todos os prompts
+                        em vez de uniformemente entre as categorias.
                    
     Returns:
         Um dicionário contendo a categoria e o prompt selecionado.
@@ -79,23 +276,232 @@ def generate_random_prompt(categories: Dict[str, List[Union[str, Dict[str, str]]
         >>> print(result)
         {'category': 'black_mirror', 'prompt': 'Prompt 1'}
     """
+    if isinstance(categories, FrozenCategories):
+        if not weight_by_size:
+            return categories.pick()
+        
+        flat = categories.flat
+        if not flat:
+            raise ValueError("As categorias não contêm itens")
+        category_name, prompt_text = flat[_randbelow(len(flat))]
+        return {
+            "category": category_name,
+            "prompt": prompt_text
+        }
+    
     if not categories:
         raise ValueError("As categorias não podem estar vazias")
     
-    # Seleciona uma categoria aleatória
-    category_name = random.choice(list(categories.keys()))
+    if weight_by_size:
+        # Sorteia a posição do prompt entre todos e localiza sua categoria
+        total = sum(map(len, categories.values()))
+        if not total:
+            raise ValueError("As categorias não contêm itens")
+        index = _randbelow(total)
+        for category_name, category_items in categories.items():
+            if index < len(category_items):
+                return {
+                    "category": category_name,
+                    "prompt": _prompt_text(category_items[index])
+                }
+            index -= len(category_items)
+    
+    # Seleciona uma categoria aleatória, sem copiar as chaves para uma lista
+    category_name = next(islice(categories, _randbelow(len(categories)), None))
     category_items = categories[category_name]
     
     if not category_items:
         raise ValueError(f"A categoria '{category_name}' não contém itens")
     
     # Seleciona um item aleatório da categoria
-    item = random.choice(category_items)
-    
-    # Extrai o texto do prompt (pode ser uma string ou um dicionário com uma chave "description")
-    prompt_text = item["description"] if isinstance(item, dict) and "description" in item else item
-    
     return {
         "category": category_name,
-        "prompt": prompt_text
-    }
\ No newline at end of file
+        "prompt": _prompt_text(category_items[_randbelow(len(category_items))])
+    }
+
+
+def generate_random_prompts_batch(
+    categories: Union[Dict[str, List[Union[str, Dict[str, str]]]], FrozenCategories],
+    count: int,
+    weight_by_size: bool = False
+) -> List[Prompt]:
+    """
+    Gera vários prompts aleatórios de uma vez.
+    
+    Cada prompt é sorteado como em generate_random_prompt (categoria uniforme,
+    depois um item uniforme da categoria, ou uniforme entre todos os prompts
+    com weight_by_size). Para lotes grandes, e com NumPy disponível, os índices
+    são sorteados de forma vetorizada.
+    
+    Os prompts são retornados como tuplas nomeadas Prompt, mais leves que um
+    dicionário por item; use prompt._asdict() quando um dicionário for
+    necessário (por exemplo, para serializar em JSON).
+    
+    Args:
+        categories: Dicionário de categorias ou categorias congeladas, como em
+                    generate_random_prompt.
+        count: Número de prompts para gerar.
+        weight_by_size: Se True, sorteia uniformemente entre todos os prompts
+                        em vez de uniformemente entre as categorias.
+        
+    Returns:
+        Uma lista de Prompt com a categoria e o prompt selecionado.
+        
+    Raises:
+        ValueError: Se as categorias estiverem vazias ou se uma categoria
+                    sorteada não contiver itens.
+    """
+    frozen = isinstance(categories, FrozenCategories)
+    if not frozen and not categories:
+        raise ValueError("As categorias não podem estar vazias")
+    
+    if count <= 0:
+        return []
+    
+    if frozen and weight_by_size:
+        # Cada item da lista achatada já é um Prompt compartilhado
+        flat = categories.flat
+        if not flat:
+            raise ValueError("As categorias não contêm itens")
+        if np is None or count < _NUMPY_BATCH_MIN:
+            return [flat[_randbelow(len(flat))] for _ in range(count)]
+        indexes = _numpy_rng().integers(0, len(flat), size=count)
+        return list(itemgetter(*indexes.tolist())(flat))
+    
+    if np is None or count < _NUMPY_BATCH_MIN:
+        return [Prompt(**generate_random_prompt(categories, weight_by_size)) for _ in range(count)]
+    
+    if frozen:
+        names, lists = categories.names, categories.prompts
+    else:
+        names = tuple(categories)
+        lists = tuple(categories[name] for name in names)
+    
+    sizes = np.fromiter((len(items) for items in lists), dtype=np.int64, count=len(lists))
+    rng = _numpy_rng()
+    
+    if weight_by_size:
+        # Posições sorteadas entre todos os prompts, localizadas nas categorias
+        # pelos tamanhos acumulados
+        ends = np.cumsum(sizes)
+        total = int(ends[-1])
+        if not total:
+            raise ValueError("As categorias não contêm itens")
+        positions = rng.integers(0, total, size=count)
+        category_indexes = np.searchsorted(ends, positions, side="right")
+        item_indexes = positions - (ends - sizes)[category_indexes]
+    else:
+        category_indexes = rng.integers(0, len(names), size=count)
+        chosen_sizes = sizes[category_indexes]
+        
+        empty = chosen_sizes == 0
+        if empty.any():
+            name = names[int(category_indexes[empty.argmax()])]
+            raise ValueError(f"A categoria '{name}' não contém itens")
+        
+        item_indexes = rng.integers(0, chosen_sizes)
+    
+    # Prompts congelados já são texto; _prompt_text os devolve como estão
+    return [
+        Prompt(names[c], _prompt_text(lists[c][i]))
+        for c, i in zip(category_indexes.tolist(), item_indexes.tolist())
+    ]
+
+
+def iter_random_prompts(
+    categories: Union[Dict[str, List[Union[str, Dict[str, str]]]], FrozenCategories],
+    weight_by_size: bool = False,
+    buffer_size: int = _PROMPT_BUFFER_SIZE
+) -> Iterator[Prompt]:
+    """
+    Gera prompts aleatórios indefinidamente.
+    
+    As categorias são congeladas com freeze_categories na primeira iteração, e
+    os prompts são sorteados em blocos de buffer_size com
+    generate_random_prompts_batch e entregues um a um, então o custo de cada
+    sorteio vetorizado é dividido entre todo o bloco. Alterações no dicionário
+    depois disso não são vistas pelo iterador.
+    
+    Args:
+        categories: Dicionário de categorias ou categorias congeladas, como em
+                    generate_random_prompt.
+        weight_by_size: Se True, sorteia uniformemente entre todos os prompts
+                        em vez de uniformemente entre as categorias.
+        buffer_size: Número de prompts sorteados de cada vez.
+        
+    Yields:
+        Prompt com a categoria e o prompt selecionado.
+        
+    Raises:
+        ValueError: Se as categorias estiverem vazias, se uma categoria
+                    sorteada não contiver itens ou se buffer_size não for
+                    positivo.
+    """
+    if buffer_size <= 0:
+        raise ValueError("O tamanho do buffer deve ser positivo")
+    
+    if not isinstance(categories, FrozenCategories):
+        categories = freeze_categories(categories)
+    
+    while True:
+        yield from generate_random_prompts_batch(categories, buffer_size, weight_by_size)
+
+
+def _random_open() -> float:
+    """
+    Sorteia um float no intervalo aberto (0, 1).
+    
+    random.random() pode retornar 0.0, e o Algoritmo L tira o logaritmo do
+    sorteio (e de 1 menos o peso derivado dele), então os dois extremos
+    precisam ser excluídos.
+    """
+    value = random.random()
+    while not value:
+        value = random.random()
+    return value
+
+
+def _numpy_rng():
+    """
+    Cria um np.random.Generator semeado a partir do módulo random.
+    
+    A semente sai do gerador global de random, então random.seed() também
+    torna reprodutíveis os sorteios feitos com NumPy. Cada chamada recebe o
+    próprio Generator, que não é compartilhado entre threads, e o estado
+    global de np.random nunca é tocado.
+    """
+    return np.random.default_rng(random.getrandbits(64))
+
+
+def _prompt_text(item: Union[str, Dict[str, str]]) -> Union[str, Dict[str, str]]:
+    """Extrai o texto do prompt (uma string ou um dicionário com "description")."""
+    return item.get("description", item) if isinstance(item, dict) else item
+
+
+def _make_picker(names: tuple, prompts: tuple) -> Callable[[], Dict[str, str]]:
+    """
+    Cria uma função de sorteio especializada para categorias congeladas.
+    
+    O número de categorias, os nomes, os prompts e os tamanhos de cada
+    categoria ficam ligados ao closure, então cada sorteio é só dois
+    _randbelow e dois acessos a tuplas.
+    """
+    randbelow = _randbelow
+    count = len(names)
+    sizes = tuple(len(category_prompts) for category_prompts in prompts)
+    
+    def pick() -> Dict[str, str]:
+        # Seleciona uma categoria aleatória
+        index = randbelow(count)
+        size = sizes[index]
+        
+        if not size:
+            raise ValueError(f"A categoria '{names[index]}' não contém itens")
+        
+        # Seleciona um prompt aleatório da categoria
+        return {
+            "category": names[index],
+            "prompt": prompts[index][randbelow(size)]
+        }
+    
+    return pick